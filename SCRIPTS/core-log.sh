@@ -8,32 +8,17 @@ catg="${1:-}"; title="${2:-}"; did="${3:-}"; nxt="${4:-}"; blockers="${5:-}"
 TS="$(date -Iseconds)"
 DAY="$(date +%F)"
 KEY="[[CORE_LOG:$DAY|$catg|$title]]"
-touch RULES.md
-grep -Fq "$KEY" RULES.md 2>/dev/null && { echo "SKIP: already logged"; exit 0; }
-
-{
-  echo ""
-  echo "---"
-  echo ""
-  echo "## קטגוריה: $catg"
-  echo ""
-  echo "### $title — $TS"
-  echo "$KEY"
-  echo ""
-  echo "**מה בוצע**"
-  echo "- $did"
-  echo ""
-  echo "**מה הבא**"
-  echo "- $nxt"
-  echo ""
-  echo "**חסמים**"
-  echo "- ${blockers:-אין חסמים ידועים כרגע}"
-  echo ""
-} >> RULES.md
+# append-only ledger entry (flock + fsync); RULES.md is rendered from the ledger on demand:
+#   python3 scripts/run_ledger.py render
+rc=0
+python3 scripts/run_ledger.py append core-log --key "$KEY" --unique \
+  "category=$catg" "title=$title" "did=$did" "next=$nxt" "blockers=$blockers" "local_ts=$TS" >/dev/null || rc=$?
+[ "$rc" -eq 3 ] && { echo "SKIP: already logged"; exit 0; }
+[ "$rc" -eq 0 ] || exit "$rc"
 
 printf "{ \"last_update\": \"%s\", \"category\": \"%s\", \"title\": \"%s\", \"key\": \"%s\" }\n" "$TS" "$catg" "$title" "$KEY" > STATE/last_update.json
 
-git add RULES.md STATE/last_update.json >/dev/null 2>&1 || true
+git add STATE/run-ledger STATE/last_update.json >/dev/null 2>&1 || true
 git commit -m "RULES: [$catg] $title ($TS)" >/dev/null 2>&1 || true
 git push >/dev/null 2>&1 || true
 echo "LOGGED: [$catg] $title"
@@ -4,7 +4,8 @@ set +H 2>/dev/null || true
 CORE="$HOME/system-core"
 cd "$CORE"
 TS="$(date -Iseconds)"
-FN="STATE/status-$TS.txt"
+TSF="${TS//:/-}"  # colon-free for file names
+FN="STATE/status-$TSF.txt"
 {
   echo "____ SYSTEM-CORE STATUS ____"
   echo "Timestamp: $TS"
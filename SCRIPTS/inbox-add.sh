@@ -10,8 +10,9 @@ TITLE="${2:-}"
 [ -n "$CAT" ] && [ -n "$TITLE" ] || { echo "Usage: inbox-add <CATEGORY> <TITLE>"; exit 2; }
 
 TS="$(date -Iseconds)"
+TSF="${TS//:/-}"  # colon-free for file names
 SAFE_TITLE="$(printf "%s" "$TITLE" | tr " /:\t" "____" | tr -cd "[:alnum:]_א-ת-")"
-FN="INBOX/${TS}__${CAT}__${SAFE_TITLE}.md"
+FN="INBOX/${TSF}__${CAT}__${SAFE_TITLE}.md"
 
 echo "# $TITLE" > "$FN"
 echo "" >> "$FN"
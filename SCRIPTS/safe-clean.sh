@@ -5,7 +5,8 @@ CORE="$HOME/system-core"
 cd "$CORE"
 
 TS="$(date -Iseconds)"
-TRASH="TRASH/$TS"
+TSF="${TS//:/-}"  # colon-free for file names
+TRASH="TRASH/$TSF"
 mkdir -p "$TRASH"
 
 # Only move files explicitly listed in STATE/cleanup-move-list.txt (one path per line, relative to CORE)
@@ -15,25 +16,12 @@ if [ ! -f "$LIST" ]; then
   exit 2
 fi
 
-moved=0
-while IFS= read -r p; do
-  [ -z "$p" ] && continue
-  case "$p" in
-    .git/*|.git|*/.git/*) echo "SKIP (git internals): $p"; continue ;;
-  esac
-  if [ -e "$p" ]; then
-    mkdir -p "$TRASH/$(dirname "$p")"
-    mv -f "$p" "$TRASH/$p"
-    echo "MOVED: $p -> $TRASH/$p"
-    moved=$((moved+1))
-  else
-    echo "MISSING: $p"
-  fi
-done < "$LIST"
+# one batched pass (scripts/move_engine.py): globs/dirs expanded, .git skipped,
+# STATE/cleanup-move-$TSF.json doubles as the undo manifest
+python3 scripts/move_engine.py move --dest "$TRASH" --list "$LIST" --manifest "STATE/cleanup-move-$TSF.json"
+moved="$(python3 -c 'import json,sys; print(json.load(open(sys.argv[1]))["moved"])' "STATE/cleanup-move-$TSF.json")"
 
-echo "{\"timestamp\":\"$TS\",\"trash\":\"$TRASH\",\"moved\":$moved}" > "STATE/cleanup-move-$TS.json"
-
-git add TRASH "STATE/cleanup-move-$TS.json" "$LIST" 2>/dev/null || true
+git add TRASH "STATE/cleanup-move-$TSF.json" "$LIST" 2>/dev/null || true
 git commit -m "CLEAN: staged moves to TRASH ($TS)" >/dev/null 2>&1 || true
 git push >/dev/null 2>&1 || true
 
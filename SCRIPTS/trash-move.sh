@@ -4,11 +4,9 @@ CORE="$HOME/system-core"
 cd "$CORE"
 [ $# -ge 1 ] || { echo "Usage: trash-move <path1> [path2...]"; exit 2; }
 TS="$(date -Iseconds)"
-DST="TRASH/$TS"
+TSF="${TS//:/-}"  # colon-free for file names
+DST="TRASH/$TSF"
 mkdir -p "$DST"
-for p in "$@"; do
-  [ -e "$p" ] || { echo "SKIP (missing): $p"; continue; }
-  mv -n "$p" "$DST/" || true
-  echo "MOVED: $p -> $DST/"
-done
+# flat layout like before; name clashes get a __N suffix instead of being skipped
+python3 scripts/move_engine.py move --flatten --dest "$DST" --manifest "$DST.manifest.json" "$@"
 echo "$DST"
@@ -1,41 +1,194 @@
-import json, os, glob, datetime
+#!/usr/bin/env python3
+"""Unified health roll-up: STATE/unified/latest.json and docs/data/unified.json.
 
-def safe_load(path):
-    try:
-        with open(path) as f:
-            return json.load(f)
-    except:
-        return None
-
-timestamp = datetime.datetime.utcnow().isoformat()
-
-# latest governance raw
-gov_dirs = sorted(glob.glob("STATE/governance-v4/*"), reverse=True)
-gov = None
-if gov_dirs:
-    gov = safe_load(os.path.join(gov_dirs[0], "raw.json"))
-
-# pdf-system latest
-pdf_path = os.path.expanduser("../pdf-system/STATE/latest/latest.json")
-pdf = safe_load(pdf_path)
-
-health = 0
-if gov: health += 40
-if pdf and pdf.get("status") == "PASS": health += 30
-cloud_verified = False
-
-unified = {
-    "timestamp": timestamp,
-    "system_core": gov if gov else "NO_DATA",
-    "pdf_system": pdf if pdf else "NO_DATA",
-    "cloud_verified": cloud_verified,
-    "health_score": health
+Every source is a collector: a spec (name, kind, where, weight, timeout, ttl) run
+by the loader registered for its kind. Built in: "file" (a path), "repo_state" (a
+file in a sibling repo's STATE/) and "http" (a local JSON endpoint); register()
+adds more. Collectors run concurrently, so the roll-up takes as long as the
+slowest source, not the sum. Results are cached in STATE/unified/collector-cache.json:
+a file source is re-read only when its mtime changed or its ttl ran out.
+
+Extra sources come from STATE/unified/sources.json (or AGGREGATE_SOURCES):
+  [{"name": "tasks", "kind": "repo_state", "repo": "task-system", "path": "latest.json",
+    "weight": 10, "pass": {"key": "status", "value": "PASS"}, "timeout": 2, "ttl": 300}]
+
+  python scripts/aggregate_state.py
+"""
+import os, sys, json, time, datetime, threading, urllib.request
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+
+import run_index
+
+UNIFIED = Path("STATE/unified")
+CACHE = UNIFIED / "collector-cache.json"
+DOCS = Path("docs/data")
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_TTL = 300
+
+def _governance_raw():
+    d = run_index.latest()
+    return str(d / "raw.json") if d else None
+
+# the two sources the roll-up always had; weights add up to the old health_score
+BUILTIN = [
+    {"name": "system_core", "kind": "file", "path": _governance_raw, "weight": 40},
+    {"name": "pdf_system", "kind": "repo_state", "repo": "pdf-system", "path": "latest/latest.json",
+     "weight": 30, "pass": {"key": "status", "value": "PASS"}},
+]
+
+class SourceMissing(Exception):
+    pass
+
+def _read_json(path):
+    p = Path(path)
+    if not p.is_file():
+        raise SourceMissing(str(p))
+    return json.loads(p.read_text(encoding="utf-8"))
+
+def _file_path(spec):
+    path = spec["path"]() if callable(spec["path"]) else spec["path"]
+    if not path:
+        raise SourceMissing("no path")
+    return os.path.expanduser(path)
+
+def _repo_state_path(spec):
+    base = spec.get("base") or os.environ.get("AGGREGATE_REPOS_BASE") or ".."
+    return os.path.join(base, spec["repo"], "STATE", spec["path"])
+
+def load_http(spec):
+    with urllib.request.urlopen(spec["url"], timeout=spec.get("timeout", DEFAULT_TIMEOUT)) as r:
+        return json.loads(r.read().decode("utf-8"))
+
+# kind -> (loader, path resolver or None); a resolver enables the mtime check
+KINDS = {
+    "file": (lambda spec: _read_json(_file_path(spec)), _file_path),
+    "repo_state": (lambda spec: _read_json(_repo_state_path(spec)), _repo_state_path),
+    "http": (load_http, None),
 }
 
-with open("STATE/unified/latest.json","w") as f:
-    json.dump(unified, f, indent=2)
+def register(kind, loader, resolve=None):
+    KINDS[kind] = (loader, resolve)
+
+def load_sources():
+    specs = list(BUILTIN)
+    cfg = Path(os.environ.get("AGGREGATE_SOURCES") or UNIFIED / "sources.json")
+    if cfg.is_file():
+        specs += json.loads(cfg.read_text(encoding="utf-8"))
+    return specs
+
+def _where(spec):
+    """(path or url, mtime or None) identifying what the source would read now."""
+    resolve = KINDS[spec["kind"]][1]
+    if resolve is None:
+        return spec.get("url"), None
+    try:
+        path = resolve(spec)
+        return path, os.stat(path).st_mtime
+    except (OSError, SourceMissing):
+        return None, None
+
+def _passed(spec, data):
+    cond = spec.get("pass")
+    if not data:
+        return False  # missing or empty ([] / {}), as the old `if gov:` check
+    if not cond:
+        return True
+    return isinstance(data, dict) and data.get(cond["key"]) == cond["value"]
+
+def collect_one(spec, cached):
+    """(data or None, report) for one source; served from cache when still fresh."""
+    t0 = time.perf_counter()
+    now = time.time()
+    where, mtime = _where(spec)
+    ttl = spec.get("ttl", DEFAULT_TTL)
+    if (cached and now - cached["at"] < ttl and where is not None
+            and cached.get("where") == where and cached.get("mtime") == mtime):
+        return cached["data"], {"status": "ok", "cached": True, "latency_ms": round((time.perf_counter() - t0) * 1000, 2)}
+    try:
+        data = KINDS[spec["kind"]][0](spec)
+        rep = {"status": "ok"}
+    except SourceMissing as e:
+        data, rep = None, {"status": "missing", "error": str(e)}
+    except Exception as e:
+        data, rep = None, {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    rep.update({"cached": False, "latency_ms": round((time.perf_counter() - t0) * 1000, 2), "where": where, "mtime": mtime})
+    return data, rep
+
+def _spawn(fn, *args):
+    """Run fn in a daemon thread; a hung source must not keep the process alive at exit
+    (executor threads are joined by the interpreter even after shutdown(wait=False))."""
+    fut = Future()
+    def run():
+        try:
+            fut.set_result(fn(*args))
+        except BaseException as e:
+            fut.set_exception(e)
+    threading.Thread(target=run, daemon=True).start()
+    return fut
+
+def collect(specs, cache):
+    """Run every collector at once; each gets its own timeout from the common start."""
+    results = {}
+    t0 = time.monotonic()
+    futs = [(s, _spawn(collect_one, s, cache.get(s["name"]))) for s in specs]
+    for spec, fut in futs:
+        timeout = spec.get("timeout", DEFAULT_TIMEOUT)
+        try:
+            data, rep = fut.result(timeout=max(0.0, t0 + timeout - time.monotonic()))
+        except FutureTimeout:
+            data, rep = None, {"status": "timeout", "cached": False, "latency_ms": round(timeout * 1000, 2)}
+        results[spec["name"]] = (data, rep)
+    return results
+
+def load_cache():
+    try:
+        return json.loads(CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    UNIFIED.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE.with_name(CACHE.name + ".tmp")
+    tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, CACHE)
+
+def main():
+    t0 = time.perf_counter()
+    specs = load_sources()
+    cache = load_cache()
+    results = collect(specs, cache)
+
+    unified = {"timestamp": datetime.datetime.utcnow().isoformat()}
+    health = 0
+    sources = {}
+    for spec in specs:
+        data, rep = results[spec["name"]]
+        unified[spec["name"]] = data if data else "NO_DATA"
+        ok = _passed(spec, data)
+        if ok:
+            health += spec.get("weight", 0)
+        sources[spec["name"]] = {"kind": spec["kind"], "status": rep["status"], "pass": ok,
+                                 "weight": spec.get("weight", 0), "cached": rep["cached"],
+                                 "latency_ms": rep["latency_ms"], **({"error": rep["error"]} if "error" in rep else {})}
+        if rep["status"] == "ok" and not rep["cached"]:
+            cache[spec["name"]] = {"at": time.time(), "where": rep["where"], "mtime": rep["mtime"], "data": data}
+        elif rep["status"] != "ok":
+            cache.pop(spec["name"], None)
+    unified["cloud_verified"] = False
+    unified["health_score"] = health
+    unified["sources"] = sources
+    unified["collect_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+
+    save_cache(cache)
+    DOCS.mkdir(parents=True, exist_ok=True)
+    for out in (UNIFIED / "latest.json", DOCS / "unified.json"):
+        with open(out, "w") as f:
+            json.dump(unified, f, indent=2)
 
-with open("docs/data/unified.json","w") as f:
-    json.dump(unified, f, indent=2)
+    for name, s in sources.items():
+        print(f"{name}: {s['status']}{' (cached)' if s['cached'] else ''} {s['latency_ms']}ms", file=sys.stderr)
+    print("Unified state generated.")
 
-print("Unified state generated.")
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,233 @@
-import os, sys, json, subprocess, pathlib, datetime
+import os, sys, json, time, shutil, tempfile, subprocess, pathlib, datetime
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import run_index
+import run_ledger
+import move_engine
+import tracing
 
 def sh(*cmd, cwd=None):
-    return subprocess.check_output(cmd, cwd=cwd).decode()
+    return subprocess.check_output(cmd, cwd=cwd, stderr=subprocess.PIPE).decode()
 
 def move_only_trash(root, plan):
-    moved=0
-    missing=0
+    doc=move_engine.move(root, plan.read_text(encoding="utf-8").splitlines(), "TRASH")
+    return doc["moved"], len(doc["missing"])
+
+def clone(owner, repo, root, extra=()):
+    # GH_CLONE_URL_TEMPLATE (e.g. file:///srv/bare/{repo}.git) clones with plain git
+    # instead of `gh repo clone`; the self-test points it at local bare repos
+    tpl=os.environ.get("GH_CLONE_URL_TEMPLATE")
+    if tpl:
+        sh("git","clone","--depth","1",*extra,tpl.format(owner=owner, repo=repo),str(root))
+    else:
+        sh("gh","repo","clone",f"{owner}/{repo}",str(root),"--","--depth","1",*extra)
+
+def sparse_patterns(plan):
+    """No-cone sparse-checkout patterns: every plan path and its TRASH/ destination."""
+    pats=[]
     for line in plan.read_text(encoding="utf-8").splitlines():
-        rel=line.strip()
+        rel=line.strip().strip("/")
         if not rel: continue
-        src=root/rel
-        if src.exists():
-            dst=root/"TRASH"/rel
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            src.rename(dst)
-            moved+=1
+        if rel[0] in "!#":
+            rel="\\"+rel
+        pats.append("/"+rel)
+        pats.append("/TRASH/"+rel)
+    return pats
+
+def clone_sparse(owner, repo, root, plan):
+    """Partial clone (no blobs) with a sparse checkout of the plan paths only, so only
+    the blobs being moved are fetched. Needs uploadpack.allowFilter on the server
+    (GitHub has it; local bare repos need it set)."""
+    clone(owner, repo, root, ("--filter=blob:none","--no-checkout"))
+    pats=sparse_patterns(plan)
+    subprocess.run(["git","sparse-checkout","set","--no-cone","--stdin"],cwd=root,check=True,
+                   input="\n".join(pats).encode("utf-8"),capture_output=True)
+    sh("git","checkout","-q",cwd=root)
+
+def disk_kb(path):
+    total=0
+    for dp,_,fns in os.walk(path):
+        for fn in fns:
+            try:
+                total+=os.lstat(os.path.join(dp,fn)).st_size
+            except OSError:
+                pass
+    return total//1024
+
+def apply_one(owner, repo, plan, ts, mode="full"):
+    """Clone, move, commit and push one repo in its own temp dir. Returns its report entry.
+
+    mode "sparse" uses clone_sparse; "full" clones the whole tip with --depth 1."""
+    t0=time.perf_counter()
+    entry={"repo":repo,"plan":str(plan),"mode":mode}
+    work=pathlib.Path(tempfile.mkdtemp(prefix=f"apply-{repo}-"))
+    root=work/repo
+    try:
+        try:
+            if mode=="sparse":
+                clone_sparse(owner, repo, root, plan)
+            else:
+                clone(owner, repo, root)
+        except Exception:
+            entry["status"]="CLONE_FAIL"
+            return entry
+        entry["clone_s"]=round(time.perf_counter()-t0,3)
+        entry["disk_kb"]=disk_kb(root)
+
+        t1=time.perf_counter()
+        moved,missing=move_only_trash(root,plan)
+        subprocess.run(["git","add","-A"],cwd=root)
+        diff=sh("git","diff","--cached","--name-only",cwd=root)
+        entry["move_s"]=round(time.perf_counter()-t1,3)
+        entry["moved"]=moved
+        entry["missing"]=missing
+        if not diff.strip():
+            entry["status"]="NO_CHANGES"
+            return entry
+
+        t2=time.perf_counter()
+        subprocess.run(["git","config","user.name","yaniv-bot"],cwd=root)
+        subprocess.run(["git","config","user.email","yaniv-bot@users.noreply.github.com"],cwd=root)
+        subprocess.run(["git","commit","-q","-m",f"cleanup: MOVE ONLY to TRASH ({ts})"],cwd=root)
+        push=subprocess.run(["git","push","-q"],cwd=root,capture_output=True)
+        entry["push_s"]=round(time.perf_counter()-t2,3)
+        if push.returncode==0:
+            entry["status"]="APPLIED"
         else:
-            missing+=1
-    return moved, missing
+            entry["status"]="PUSH_FAIL"
+            entry["error"]=push.stderr.decode(errors="replace").strip()[-300:]
+        return entry
+    finally:
+        entry["total_s"]=round(time.perf_counter()-t0,3)
+        shutil.rmtree(work, ignore_errors=True)
+
+def apply_plans(owner, plans, max_apply, ts, concurrency=None, mode=None):
+    """Run apply_one over plans with a bounded process pool; report keeps plan order.
+
+    Jobs are submitted in plan order, and never more than the max_apply slots still
+    free: a finished job that did not push frees its slot for the next plan. So the
+    repos applied are exactly the ones the sequential loop would apply."""
+    concurrency=concurrency or int(os.environ.get("APPLY_CONCURRENCY") or "4")
+    mode=mode or os.environ.get("APPLY_MODE") or "full"
+    # one plan per repo (the newest), so two workers never push the same repo
+    seen=set()
+    jobs=[]
+    for plan in plans:
+        repo=plan.name.replace("__move-list.txt","")
+        if repo in seen: continue
+        seen.add(repo)
+        jobs.append((repo, plan))
+    report=[None]*len(jobs)
+    applied=0
+    nxt=0
+    running={}
+    with ProcessPoolExecutor(max_workers=max(1, min(concurrency, len(jobs) or 1))) as ex:
+        while True:
+            while nxt<len(jobs) and len(running)<concurrency and applied+len(running)<max_apply:
+                repo, plan = jobs[nxt]
+                running[ex.submit(apply_one, owner, repo, plan, ts, mode)]=nxt
+                nxt+=1
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in finished:
+                i=running.pop(f)
+                report[i]=f.result()
+                if report[i]["status"]=="APPLIED":
+                    applied+=1
+    for i in range(nxt, len(jobs)):
+        repo, plan = jobs[i]
+        report[i]={"repo":repo,"plan":str(plan),"mode":mode,"status":"SKIPPED_MAX_APPLY"}
+    return report, applied
+
+def fixture(tmp, names, payload=2*1024*1024):
+    """Bare repos under tmp/bare standing in for GitHub, plus one move plan per repo.
+    A name ending in 5 gets a plan with nothing to move. Point GH_CLONE_URL_TEMPLATE
+    at file://tmp/bare/{repo}.git to use them."""
+    plans=[]
+    for n in names:
+        seed=tmp/"seed"/n
+        (seed/"docs").mkdir(parents=True)
+        (seed/"keep.txt").write_text("keep\n")
+        (seed/"old.txt").write_text("old\n")
+        (seed/"docs"/"draft.md").write_text("draft\n")
+        # unrelated payload a sparse apply must not download
+        (seed/"big.bin").write_bytes(os.urandom(payload))
+        sh("git","init","-q","-b","main",str(seed))
+        sh("git","-c","user.name=t","-c","user.email=t@t","add","-A",cwd=seed)
+        sh("git","-c","user.name=t","-c","user.email=t@t","commit","-q","-m","init",cwd=seed)
+        bare=tmp/"bare"/f"{n}.git"
+        sh("git","clone","-q","--bare",str(seed),str(bare))
+        sh("git","--git-dir",str(bare),"config","uploadpack.allowFilter","true")
+        plan=tmp/"plans"/f"{n}__move-list.txt"
+        plan.parent.mkdir(parents=True, exist_ok=True)
+        plan.write_text("old.txt\ndocs/draft.md\nnot-there.txt\n" if not n.endswith("5") else "nothing.txt\n", encoding="utf-8")
+        plans.append(plan)
+    return plans
+
+def self_test():
+    """End to end against local bare repos standing in for GitHub, in both modes."""
+    tmp=pathlib.Path(tempfile.mkdtemp(prefix="apply-selftest-"))
+    try:
+        os.environ["GH_CLONE_URL_TEMPLATE"]=f"file://{tmp}/bare/{{repo}}.git"
+        results=[]
+        for mode in ("full","sparse"):
+            # the third plan (name ending in 5) has nothing to move
+            plans=fixture(tmp, [f"{mode}{i}" for i in range(3, 9)])
+            t0=time.perf_counter()
+            report, applied=apply_plans("selftest", plans, 3, "selftest", concurrency=4, mode=mode)
+            elapsed=time.perf_counter()-t0
+            statuses=[e["status"] for e in report]
+            # same as the sequential loop: the first three plans with changes, in plan order
+            ok=applied==3 and statuses==["APPLIED","APPLIED","NO_CHANGES","APPLIED","SKIPPED_MAX_APPLY","SKIPPED_MAX_APPLY"]
+            for e in report:
+                files=sh("git","--git-dir",str(tmp/"bare"/f"{e['repo']}.git"),"ls-tree","-r","--name-only","main").split()
+                want=["TRASH/docs/draft.md","TRASH/old.txt","big.bin","keep.txt"] if e["status"]=="APPLIED" else ["big.bin","docs/draft.md","keep.txt","old.txt"]
+                ok=ok and sorted(files)==want
+            kb=max((e.get("disk_kb",0) for e in report if e["status"]=="APPLIED"), default=0)
+            if mode=="sparse":
+                ok=ok and kb<512
+            results.append({"mode":mode,"ok":ok,"applied":applied,"statuses":statuses,"max_disk_kb":kb,"elapsed_s":round(elapsed,3)})
+        for r in results:
+            print(json.dumps(r))
+        return all(r["ok"] for r in results)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
 
 def main():
+    if "--self-test" in sys.argv:
+        sys.exit(0 if self_test() else 1)
     owner=sys.argv[1]
     top_n=int(sys.argv[2])
     max_apply=int(sys.argv[3])
-    ts=datetime.datetime.utcnow().isoformat()
-    report=[]
-    applied=0
+    # colon-free, like governance run dirs (the ts names STATE/apply-reports/<ts>)
+    ts=datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
 
-    dash_dirs=sorted(pathlib.Path("STATE/governance-v4").glob("*"), reverse=True)
-    if not dash_dirs: return
-    dash=dash_dirs[0]
+    dash=run_index.latest()
+    if not dash: return
 
     plans=list(pathlib.Path("STATE/repo-move-lists").glob("*/**/*__move-list.txt"))
     plans=sorted(plans, reverse=True)[:top_n]
 
-    for plan in plans:
-        if applied>=max_apply: break
-        repo=plan.name.replace("__move-list.txt","")
-        root=pathlib.Path("/tmp")/repo
-        subprocess.run(["rm","-rf",str(root)])
-        try:
-            sh("gh","repo","clone",f"{owner}/{repo}",str(root),"--","--depth","1")
-        except:
-            report.append({"repo":repo,"status":"CLONE_FAIL"})
-            continue
-
-        moved,missing=move_only_trash(root,plan)
-
-        subprocess.run(["git","add","-A"],cwd=root)
-        diff=sh("git","diff","--cached","--name-only",cwd=root)
-        if diff.strip():
-            subprocess.run(["git","config","user.name","yaniv-bot"],cwd=root)
-            subprocess.run(["git","config","user.email","yaniv-bot@users.noreply.github.com"],cwd=root)
-            subprocess.run(["git","commit","-m",f"cleanup: MOVE ONLY to TRASH ({ts})"],cwd=root)
-            subprocess.run(["git","push"],cwd=root)
-            report.append({"repo":repo,"status":"APPLIED","moved":moved})
-            applied+=1
-        else:
-            report.append({"repo":repo,"status":"NO_CHANGES"})
+    tracing.from_env()
+    t0=time.perf_counter()
+    with tracing.span("apply_plans"):
+        report, applied=apply_plans(owner, plans, max_apply, ts)
+    # repos run in worker processes; their per-phase timings come back in the report
+    for e in report:
+        tracing.count("apply."+e["status"])
+        for phase in ("clone","move","push","total"):
+            if phase+"_s" in e:
+                tracing.record("apply_plans/repo/"+phase, e[phase+"_s"])
 
     out=pathlib.Path("STATE/apply-reports")/ts
     out.mkdir(parents=True, exist_ok=True)
     (out/"apply_report.json").write_text(json.dumps(report,indent=2),encoding="utf-8")
+    if tracing.enabled():
+        tracing.write(out/"timings.json")
+    print(f"applied={applied} scanned={len(plans)} elapsed={time.perf_counter()-t0:.1f}s")
 
-    rules=pathlib.Path("RULES.md")
-    rules.touch(exist_ok=True)
-    with rules.open("a",encoding="utf-8") as f:
-        f.write(f"\n- {ts} | APPLY MOVE-ONLY (Actions)\n")
-        f.write(f"  - applied={applied} scanned={len(plans)}\n")
-        f.write(f"  - policy: NO DELETE (MOVE ONLY to TRASH)\n")
+    run_ledger.append("apply", run=ts, applied=applied, scanned=len(plans), mode=os.environ.get("APPLY_MODE") or "full")
 
 if __name__=="__main__":
     main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite: stub GitHub API, synthetic inventories, recorded results.
+
+For every inventory size a gh_stub.py server is started, and each stage runs in its
+own child process so its wall time and peak RSS are its own. The stub's counters give
+the request count per stage.
+
+  enumerate   list_repos() against the stub (paginated REST)
+  score       columnar scoring + top-N over the inventory (no network)
+  render      JSONL stream, pretty JSON view and dashboard for the inventory (no network)
+  governance  governance_v4_auto.py end to end in a scratch dir, against the stub
+  apply       apply_plans() over BENCH_APPLY_REPOS local bare repos (once, not per size)
+
+Results go to STATE/bench/<ts>.json and one line per (size, stage) is appended to
+STATE/bench/history.jsonl; each row carries the previous run's wall time for the
+same size/stage so regressions show up in the printed table.
+
+  python scripts/bench_suite.py [--sizes 100,10k,100k] [--stages enumerate,score,...]
+                                [--latency-ms 0] [--jitter-ms 0] [--fail-rate 0]
+                                [--rate-limit 0] [--rate-window 60] [--apply-mode full|sparse]
+
+--rate-limit is requests per --rate-window seconds. The window defaults to a minute
+rather than the stub's hour, so a small limit throttles a stage instead of hanging it.
+"""
+import os, sys, json, time, shutil, platform, tempfile, subprocess, urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = Path("STATE/bench")
+SIZES = {"100": 100, "10k": 10000, "100k": 100000}
+STAGES = ("enumerate", "score", "render", "governance", "apply")
+OWNER = "bench-owner"
+
+def _size(s):
+    return SIZES.get(s) or int(s.lower().replace("k", "000"))
+
+def _label(n):
+    return next((k for k, v in SIZES.items() if v == n), str(n))
+
+# stage bodies; each runs in a child process (python bench_suite.py --stage NAME N)
+
+def _records(n):
+    from gh_stub import synth_repos
+    from repo_record import RepoRecord
+    return [RepoRecord.from_rest(r) for r in synth_repos(OWNER, n)]
+
+def stage_enumerate(n):
+    import governance_v4_auto
+    repos, meta = governance_v4_auto.list_repos(OWNER, "")
+    assert len(repos) == n, (len(repos), n)
+    return {"repos": len(repos), "pages": meta["pages"]}
+
+def stage_score(n):
+    import scoring
+    recs = _records(n)
+    t0 = time.perf_counter()
+    scores = scoring.score_columns(scoring.columns(recs))
+    top = scoring.top_n(scores, 20)
+    return {"repos": n, "top": len(top), "inner_s": round(time.perf_counter() - t0, 4)}
+
+def stage_render(n):
+    import scoring, jsonl_stream
+    from governance_v4_auto import dashboard_lines
+    recs = _records(n)
+    scores = scoring.score_columns(scoring.columns(recs))
+    top_idx = scoring.top_n(scores, 20)
+    tmp = Path(tempfile.mkdtemp(prefix="bench-render-"))
+    try:
+        t0 = time.perf_counter()
+        want, top = set(top_idx), {}
+        with jsonl_stream.JsonlWriter(tmp / "repo-intelligence-v4.jsonl", {"generated": "bench", "owner": OWNER}) as w:
+            for i, r in enumerate(recs):
+                item = r.to_item(round(scores[i], 4))
+                w.write(item)
+                if i in want:
+                    top[i] = item
+            highest = [top[i] for i in top_idx]
+            w.close({"total": w.count, "highest_risk": highest})
+        jsonl_stream.write_pretty_view(tmp / "repo-intelligence-v4.jsonl", tmp / "repo-intelligence-v4.json",
+                                       order=["generated", "owner", "total", "repos", "highest_risk"])
+        rate = {"requests": 0, "throttled_s": 0, "budget_remaining": None}
+        (tmp / "dashboard-v4.md").write_text("\n".join(dashboard_lines(
+            OWNER, n, "/users/{owner}/repos", {"count": n, "pages": 0}, {}, rate, None, highest)), encoding="utf-8")
+        return {"repos": n, "inner_s": round(time.perf_counter() - t0, 4),
+                "json_bytes": (tmp / "repo-intelligence-v4.json").stat().st_size}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def stage_apply(n):
+    import apply_move_only_from_system_core as apply
+    tmp = Path(tempfile.mkdtemp(prefix="bench-apply-"))
+    try:
+        os.environ["GH_CLONE_URL_TEMPLATE"] = f"file://{tmp}/bare/{{repo}}.git"
+        plans = apply.fixture(tmp, [f"b{i}" for i in range(n)], payload=512 * 1024)
+        t0 = time.perf_counter()
+        report, applied = apply.apply_plans(OWNER, plans, n, "bench")
+        return {"repos": n, "applied": applied, "inner_s": round(time.perf_counter() - t0, 4),
+                "mode": os.environ.get("APPLY_MODE") or "full",
+                "max_disk_kb": max((e.get("disk_kb", 0) for e in report), default=0)}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+# harness
+
+def start_stub(n, opts):
+    cmd = [sys.executable, str(HERE / "gh_stub.py"), "--owner", OWNER, "--repos", str(n), "--port", "0",
+           "--latency-ms", str(opts["latency_ms"]), "--jitter-ms", str(opts["jitter_ms"]),
+           "--rate-limit", str(opts["rate_limit"]), "--rate-window", str(opts["rate_window"]), "--fail-rate", str(opts["fail_rate"])]
+    p = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
+    line = p.stderr.readline()
+    if "listening on" not in line:
+        p.kill()
+        raise RuntimeError(f"stub did not start: {line.strip()}")
+    return p, line.strip().rsplit(" ", 1)[-1]
+
+def stub_stats(base):
+    with urllib.request.urlopen(base + "/_stub/stats") as r:
+        return json.loads(r.read())
+
+def run_child(cmd, env, cwd=None):
+    """(exit status, stdout, wall s, peak RSS KB) of one child, RSS from its own wait4."""
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        t0 = time.perf_counter()
+        p = subprocess.Popen(cmd, stdout=out, stderr=err, env=env, cwd=cwd)
+        _, status, ru = os.wait4(p.pid, 0)
+        wall = time.perf_counter() - t0
+        p.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        if p.returncode != 0:
+            sys.stderr.write(err.read().decode(errors="replace")[-2000:])
+        # ru_maxrss is KB on Linux, bytes on macOS
+        rss = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss
+        return p.returncode, out.read().decode(errors="replace"), wall, rss
+
+def child_env(base, opts):
+    env = dict(os.environ)
+    env.update({"OWNER": OWNER, "PYTHONPATH": str(HERE),
+                "RATE_MAX_RPS": os.environ.get("RATE_MAX_RPS") or "1000000",
+                "HTTP_CACHE": "0", "SNAPSHOT_COMPACT": "0", "APPLY_MODE": opts["apply_mode"]})
+    if base:
+        env["GH_API_BASE"] = base
+    env.pop("GH_TOKEN", None)
+    env.pop("GITHUB_TOKEN", None)
+    env.pop("OWNERS", None)
+    return env
+
+def run_stage(stage, n, base, opts):
+    env = child_env(base, opts)
+    before = stub_stats(base) if base else None
+    if stage == "governance":
+        work = Path(tempfile.mkdtemp(prefix="bench-gov-"))
+        try:
+            code, out, wall, rss = run_child([sys.executable, str(HERE / "governance_v4_auto.py")], env, cwd=work)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        extra = {}
+    else:
+        code, out, wall, rss = run_child([sys.executable, str(HERE / "bench_suite.py"), "--stage", stage, str(n)], env)
+        extra = json.loads(out.strip().splitlines()[-1]) if code == 0 and out.strip() else {}
+    row = {"size": _label(n), "repos": n, "stage": stage, "ok": code == 0,
+           "wall_s": round(wall, 3), "peak_rss_kb": rss}
+    if base:
+        after = stub_stats(base)
+        row["requests"] = after["requests"] - before["requests"]
+        row["failures_injected"] = after["failures"] - before["failures"]
+        row["throttled"] = after["throttled"] - before["throttled"]
+    row.update({k: v for k, v in extra.items() if k != "repos"})
+    return row
+
+def previous_rows(root=ROOT):
+    """Latest history row per (size, stage)."""
+    prev = {}
+    try:
+        with open(root / "history.jsonl", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    r = json.loads(line)
+                    prev[(r["size"], r["stage"])] = r
+    except FileNotFoundError:
+        pass
+    return prev
+
+def run(sizes, stages, opts, root=ROOT):
+    ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
+    prev = previous_rows(root)
+    rows = []
+    for n in sizes:
+        net = [s for s in stages if s in ("enumerate", "governance")]
+        stub, base = start_stub(n, opts) if net else (None, None)
+        try:
+            for stage in stages:
+                if stage == "apply":
+                    continue
+                rows.append(run_stage(stage, n, base if stage in net else None, opts))
+                print(json.dumps(rows[-1]), file=sys.stderr)
+        finally:
+            if stub:
+                stub.kill()
+                stub.wait()
+    if "apply" in stages:
+        rows.append(run_stage("apply", opts["apply_repos"], None, opts))
+        rows[-1]["size"] = "fixture"
+    for r in rows:
+        p = prev.get((r["size"], r["stage"]))
+        if p and p.get("ok") and r["ok"] and p.get("wall_s"):
+            r["prev_wall_s"] = p["wall_s"]
+            r["ratio"] = round(r["wall_s"] / p["wall_s"], 3)
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    doc = {"ts": ts, "python": platform.python_version(), "platform": platform.platform(),
+           "numpy": numpy is not None, "options": opts, "results": rows}
+    root.mkdir(parents=True, exist_ok=True)
+    (root / f"{ts}.json").write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    with open(root / "history.jsonl", "a", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(dict(r, ts=ts), separators=(",", ":")) + "\n")
+    return doc
+
+def table(doc):
+    lines = [f"{'size':>8} {'stage':<11} {'wall_s':>8} {'rss_mb':>7} {'reqs':>6} {'prev_s':>8} {'ratio':>6}"]
+    for r in doc["results"]:
+        lines.append(f"{r['size']:>8} {r['stage']:<11} {r['wall_s']:>8} {r['peak_rss_kb'] / 1024:>7.1f} "
+                     f"{r.get('requests', '-'):>6} {r.get('prev_wall_s', '-'):>8} {r.get('ratio', '-'):>6}"
+                     + ("" if r["ok"] else "  FAILED"))
+    return "\n".join(lines)
+
+def _opt(args, flag, default):
+    if flag in args:
+        i = args.index(flag)
+        v = args[i + 1]
+        del args[i:i + 2]
+        return v
+    return default
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--stage"]:
+        print(json.dumps(globals()["stage_" + args[1]](int(args[2]))))
+        return
+    sizes = [_size(s) for s in _opt(args, "--sizes", "100,10k,100k").split(",") if s]
+    stages = [s for s in _opt(args, "--stages", ",".join(STAGES)).split(",") if s]
+    opts = {"latency_ms": float(_opt(args, "--latency-ms", 0)), "jitter_ms": float(_opt(args, "--jitter-ms", 0)),
+            "fail_rate": float(_opt(args, "--fail-rate", 0)), "rate_limit": int(_opt(args, "--rate-limit", 0)),
+            "rate_window": int(_opt(args, "--rate-window", 60)),
+            "apply_mode": _opt(args, "--apply-mode", "full"),
+            "apply_repos": int(os.environ.get("BENCH_APPLY_REPOS") or 8)}
+    if args or any(s not in STAGES for s in stages):
+        raise SystemExit(__doc__)
+    doc = run(sizes, stages, opts)
+    print(table(doc))
+    if not all(r["ok"] for r in doc["results"]):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
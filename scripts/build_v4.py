@@ -0,0 +1,167 @@
+import sys, json
+from pathlib import Path
+from datetime import datetime, timezone
+
+import gh_client
+from jsonl_stream import JsonlWriter, write_pretty_view
+import pipeline
+from repo_record import RepoRecord
+import tracing
+
+raw_path = Path(sys.argv[1])
+out_json = Path(sys.argv[2])
+out_md   = Path(sys.argv[3])
+err_path = Path(sys.argv[4])
+owner    = sys.argv[5]
+
+def eprint(*a):
+    err_path.write_text((err_path.read_text(encoding="utf-8") if err_path.exists() else "") + " ".join(map(str,a)) + "\n", encoding="utf-8")
+
+tracing.from_env()
+client = gh_client.GitHubClient(token=gh_client.resolve_token())
+
+data = json.loads(raw_path.read_text(encoding="utf-8"))
+now  = datetime.now(timezone.utc)
+
+# tags, README fingerprints, duplicates and risk come from the shared pipeline stages;
+# unchanged inputs reuse the outputs saved in STATE/pipeline/build_v4/
+records=[r for r in map(RepoRecord.from_gh_json, data) if r.name]
+pl=pipeline.Pipeline(owner, records, now=now, client=client, root=pipeline.ROOT / "build_v4")
+pl.execute(["dedupe"])
+fp_summary=pl.summary("readme")
+if fp_summary.get("failed"):
+    eprint("readme fingerprint fail:", fp_summary["failed"])
+fp_stats=fp_summary["stats"]
+dups=pl.summary("dedupe")
+dup_names=dups["duplicate_names"]
+dup_desc=dups["duplicate_descriptions"]
+dup_readme=dups["duplicate_readme_sha256"]
+dup_readme_blob=dups["duplicate_readme_blob_sha"]
+near_dups, nd_stats = dups["near_duplicates"], dups["near_duplicate_stats"]
+
+repos=[]
+errors=[]
+sampled=0
+for r, age, t, d, fp in zip(records, pl.age, pl.rows("tags"), pl.rows("dedupe"), pl.rows("readme")):
+    e = {
+        "name": r.name,
+        "private": r.private,
+        "age_days": age,
+        "critical": t["critical"],
+        "risk": d["risk"],
+        "url": r.html_url,
+        "updatedAt": r.updated_at,
+        "description": d["description"],
+        "readme_sha256": None,
+        "readme_blob_sha": None,
+        "readme_sampled": False,
+        "category": d["category"],
+    }
+    if fp is None:
+        errors.append({"repo": r.name, "error": "readme_not_fingerprinted"})
+    elif fp["readme_blob_sha"]:
+        e["readme_blob_sha"]=fp["readme_blob_sha"]
+        e["readme_sha256"]=fp["readme_sha256"]
+        e["readme_sampled"]=True
+        sampled += 1
+    repos.append(e)
+
+# sort: highest risk first, then oldest, then name
+repos.sort(key=lambda x: (-int(x.get("risk",0)), -int(x.get("age_days",0)), x.get("name","").lower()))
+
+# JSONL stream first; the pretty JSON is derived from it without a full in-memory dump
+out_jsonl = out_json.with_suffix(".jsonl")
+with JsonlWriter(out_jsonl, {
+    "generated": now.isoformat(),
+    "owner": owner,
+    "total": len(repos),
+    "sampled_readmes": sampled,
+    "readme_fingerprint": fp_stats,
+}) as w:
+    for e in repos:
+        w.write(e)
+    w.close({
+        "duplicate_names": dup_names,
+        "duplicate_descriptions": dup_desc,
+        "duplicate_readme_sha256": dup_readme,
+        "duplicate_readme_blob_sha": dup_readme_blob,
+        "near_duplicates": near_dups,
+        "near_duplicate_stats": nd_stats,
+        "errors": errors,
+    })
+write_pretty_view(out_jsonl, out_json)
+
+# dashboard
+cat_counts={}
+crit_counts={}
+for e in repos:
+    cat_counts[e["category"]] = cat_counts.get(e["category"], 0) + 1
+    crit_counts[e["critical"]] = crit_counts.get(e["critical"], 0) + 1
+
+dash=[]
+dash.append("# GOVERNANCE DASHBOARD v4 (OK)")
+dash.append("")
+dash.append(f"Owner: {owner}")
+dash.append(f"Total repos: {len(repos)}")
+dash.append(f"README fingerprinted (git blob sha, all repos): {sampled}")
+dash.append("")
+
+dash.append("## Category counts")
+for k in ["SAFE","REVIEW","DUPLICATE_RISK","ARCHIVE_STRONG"]:
+    dash.append(f"- {k}: {cat_counts.get(k,0)}")
+dash.append("")
+
+dash.append("## Critical counts")
+for k in ["HIGH","MEDIUM","LOW"]:
+    dash.append(f"- {k}: {crit_counts.get(k,0)}")
+dash.append("")
+
+dash.append("## Highest risk (top 25)")
+for e in repos[:25]:
+    vis = "private" if e["private"] else "public"
+    dash.append(f"- {e['name']} | risk={e['risk']} | {e['category']} | age={e['age_days']}d | {vis} | {e['url']}")
+dash.append("")
+
+dash.append("## Duplicate Names")
+if dup_names:
+    for g in dup_names:
+        dash.append("- " + ", ".join(g))
+else:
+    dash.append("- none")
+dash.append("")
+
+dash.append("## Duplicate Descriptions (hash)")
+if dup_desc:
+    dash.append(f"- groups: {len(dup_desc)} (see JSON)")
+else:
+    dash.append("- none")
+dash.append("")
+
+dash.append("## Duplicate README (git blob sha, all repos)")
+if dup_readme_blob:
+    for g in dup_readme_blob:
+        dash.append("- " + ", ".join(g))
+else:
+    dash.append("- none")
+dash.append("")
+
+dash.append("## Near duplicates (MinHash/LSH)")
+if near_dups:
+    for g in near_dups:
+        dash.append("- " + ", ".join(g))
+else:
+    dash.append("- none")
+dash.append("")
+
+dash += tracing.dashboard_lines()
+
+dash.append("## Build errors")
+if errors:
+    for ee in errors[:30]:
+        dash.append(f"- {ee.get('repo')} | {ee.get('error')}")
+else:
+    dash.append("- none")
+
+out_md.write_text("\n".join(dash) + "\n", encoding="utf-8")
+if tracing.enabled():
+    tracing.write(out_json.with_name("timings.json"))
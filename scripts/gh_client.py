@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+import os, sys, gzip, json, ssl, time, queue, threading, subprocess, http.client, urllib.parse
+
+import rate_limit
+import tracing
+
+DEFAULT_BASE = "https://api.github.com"
+
+class Headers(dict):
+    """Response headers with case-insensitive lookup (GitHub sends lowercase names)."""
+
+    def __init__(self, pairs=()):
+        super().__init__()
+        for k, v in pairs:
+            self[k] = v
+
+    def __setitem__(self, k, v):
+        super().__setitem__(k.lower(), v)
+
+    def __getitem__(self, k):
+        return super().__getitem__(k.lower())
+
+    def __contains__(self, k):
+        return super().__contains__(k.lower())
+
+    def get(self, k, default=None):
+        return super().get(k.lower(), default)
+
+    def update(self, *a, **kw):
+        for k, v in dict(*a, **kw).items():
+            self[k] = v
+
+def resolve_token():
+    tok = (os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or "").strip()
+    if tok:
+        return tok
+    try:
+        return subprocess.check_output(["gh", "auth", "token"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ""
+
+class GitHubClient:
+    """Keep-alive HTTP client for the GitHub REST API (http.client, stdlib only).
+
+    Connections are pooled per host and reused across calls and threads. Responses are
+    requested gzip-encoded and decompressed transparently. base_url (or GH_API_BASE)
+    can point at a local stub server; absolute api.github.com URLs are then rewritten
+    to it, so Link headers and hardcoded URLs keep working offline.
+
+    Every request passes through a shared RateScheduler: it is paced against the
+    X-RateLimit budget, and a rate-limit rejection pauses and retries it instead of failing.
+    """
+
+    def __init__(self, token="", base_url=None, timeout=45, pool_size=8, scheduler=None, throttle_retries=5):
+        self.token = token
+        self.scheduler = scheduler or rate_limit.RateScheduler.from_env()
+        self.throttle_retries = throttle_retries
+        self.base_url = (base_url or os.environ.get("GH_API_BASE") or DEFAULT_BASE).rstrip("/")
+        self.offline = self.base_url != DEFAULT_BASE
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pools = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "bytes": 0}
+
+    def url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            if self.offline and path.startswith(DEFAULT_BASE):
+                return self.base_url + path[len(DEFAULT_BASE):]
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _pool(self, key):
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(maxsize=self.pool_size)
+            return self._pools[key]
+
+    def _connect(self, scheme, host, port):
+        with self._lock:
+            self.stats["connections"] += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=ssl.create_default_context())
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key, conn):
+        try:
+            self._pool(key).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(self, method, path, headers=None, body=None, priority=rate_limit.ENUMERATE):
+        """Returns (status, Headers, text). Non-2xx statuses are returned, not raised."""
+        for _ in range(self.throttle_retries + 1):
+            self.scheduler.acquire(priority)
+            status, rh, text = self._send(method, path, headers, body)
+            wait = self.scheduler.observe(status, rh)
+            if not wait:
+                break
+            tracing.count("retries.rate_limited")
+            print(f"HTTP {status}: rate limited, pausing {int(wait)}s...", file=sys.stderr)
+        return status, rh, text
+
+    def _send(self, method, path, headers, body):
+        u = urllib.parse.urlsplit(self.url(path))
+        key = (u.scheme, u.hostname, u.port)
+        target = u.path + ("?" + u.query if u.query else "")
+        hdrs = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "system-core-governance",
+        }
+        if self.token:
+            hdrs["Authorization"] = f"Bearer {self.token}"
+        if headers:
+            hdrs.update(headers)
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+            hdrs.setdefault("Content-Type", "application/json")
+
+        for attempt in (0, 1):
+            try:
+                conn = self._pool(key).get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._connect(*key)
+                reused = False
+            try:
+                t0 = time.perf_counter()
+                conn.request(method, target, body=body, headers=hdrs)
+                resp = conn.getresponse()
+                raw = resp.read()
+                tracing.http(resp.status, time.perf_counter() - t0, len(raw))
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # stale keep-alive connection, retry once on a fresh one
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if reused:
+                with self._lock:
+                    self.stats["reused"] += 1
+            break
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        rh = Headers(resp.getheaders())
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(raw)
+        if (rh.get("Content-Encoding") or "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        return resp.status, rh, raw.decode("utf-8", errors="replace")
+
+    def get(self, path, headers=None, priority=rate_limit.ENUMERATE):
+        return self.request("GET", path, headers=headers, priority=priority)
+
+    def get_json(self, path, priority=rate_limit.ENUMERATE):
+        st, _, text = self.get(path, priority=priority)
+        if st != 200:
+            return None
+        try:
+            return json.loads(text)
+        except Exception:
+            return None
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for p in pools:
+            while True:
+                try:
+                    p.get_nowait().close()
+                except queue.Empty:
+                    break
+
+_default = None
+_default_lock = threading.Lock()
+
+def default_client(token=""):
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = GitHubClient(token=token)
+        elif token and not _default.token:
+            _default.token = token
+        return _default
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Local stand-in for api.github.com, for offline runs and benchmarks.
+
+  python scripts/gh_stub.py --repos 500 --port 8765 [--latency-ms 40 --jitter-ms 20]
+                            [--rate-limit 5000 --rate-window 3600] [--fail-rate 0.01] [--seed 1]
+  GH_API_BASE=http://127.0.0.1:8765 python scripts/governance_v4_auto.py
+
+--rate-limit sends X-RateLimit-* headers and answers 403 (remaining 0) once the
+window's budget is spent; --fail-rate answers that share of requests with a 502.
+GET /_stub/stats returns the counters (not counted itself).
+"""
+import re, sys, json, time, gzip, base64, random, hashlib, argparse, threading, urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+def synth_repos(owner, n):
+    repos = []
+    for i in range(n):
+        repos.append({
+            "name": f"repo-{i:06d}",
+            "private": i % 7 == 0,
+            "archived": i % 11 == 0,
+            "open_issues_count": (i * 37) % 60,
+            "size": (i * 7919) % 600000,
+            "pushed_at": f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}T12:00:00Z",
+            "updated_at": f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}T12:00:00Z",
+            "default_branch": "main",
+            "description": f"synthetic repo {i % 50}",
+            "html_url": f"https://github.com/{owner}/repo-{i:06d}",
+        })
+    return repos
+
+class Stub:
+    def __init__(self, owner="stub-owner", repos=100, latency_ms=0, jitter_ms=0,
+                 rate_limit=0, rate_window=3600, fail_rate=0.0, seed=1):
+        self.owner = owner
+        self.repos = synth_repos(owner, repos)
+        self.by_name = {r["name"]: r for r in self.repos}
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.window_start = time.time()
+        self.used = 0
+        self.fail_rate = fail_rate
+        self.rnd = random.Random(seed)
+
+    def admit(self):
+        """Counts one request; returns (status, extra headers). status is None for a
+        normal answer, else the injected 502 / 403 rate-limit status."""
+        with self.lock:
+            self.requests += 1
+            hdrs = {}
+            if self.rate_limit:
+                now = time.time()
+                if now >= self.window_start + self.rate_window:
+                    self.window_start, self.used = now, 0
+                reset = int(self.window_start + self.rate_window)
+                if self.used >= self.rate_limit:
+                    self.throttled += 1
+                    return 403, {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Remaining": "0",
+                                 "X-RateLimit-Reset": str(reset), "Retry-After": str(max(1, reset - int(now)))}
+                self.used += 1
+                hdrs = {"X-RateLimit-Limit": str(self.rate_limit),
+                        "X-RateLimit-Remaining": str(self.rate_limit - self.used),
+                        "X-RateLimit-Reset": str(reset), "X-RateLimit-Used": str(self.used)}
+            delay = self.latency + (self.rnd.random() * self.jitter if self.jitter else 0)
+            fail = self.fail_rate and self.rnd.random() < self.fail_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        return (502 if fail else None), hdrs
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "failures": self.failures, "throttled": self.throttled,
+                    "repos": len(self.repos)}
+
+    def readme(self, name):
+        text = f"# {name}\n\nsynthetic readme {int(name[-6:]) % 40}\n"
+        return text.encode("utf-8")
+
+    def blob_oid(self, raw):
+        return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+    def graphql_node(self, r):
+        raw = self.readme(r["name"])
+        return {
+            "name": r["name"], "isPrivate": r["private"], "isArchived": r["archived"],
+            "description": r["description"], "url": r["html_url"],
+            "pushedAt": r["pushed_at"], "updatedAt": r["updated_at"], "diskUsage": r["size"],
+            "openIssues": {"totalCount": r["open_issues_count"]}, "openPulls": {"totalCount": 0},
+            "defaultBranchRef": {"name": r["default_branch"]},
+            "rules": None, "readme1": {"oid": self.blob_oid(raw)},
+        }
+
+    def graphql(self, query, variables):
+        if "repositoryOwner" in query:
+            first = int(variables.get("first") or 50)
+            start = int(variables.get("after") or 0)
+            chunk = self.repos[start:start + first]
+            end = start + len(chunk)
+            return {"repositoryOwner": {"repositories": {
+                "pageInfo": {"hasNextPage": end < len(self.repos), "endCursor": str(end)},
+                "nodes": [self.graphql_node(r) for r in chunk],
+            }}}
+        data = {}
+        for alias, _, name in re.findall(r'(r\d+): repository\(owner: "([^"]*)", name: "([^"]*)"\)', query):
+            if name not in self.by_name:
+                data[alias] = None
+                continue
+            raw = self.readme(name)
+            data[alias] = {"readme1": {"oid": self.blob_oid(raw), "text": raw.decode("utf-8")}}
+        return data
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *a):
+            pass
+
+        def send_json(self, status, obj, extra=None):
+            extra = dict(self.rate_headers, **(extra or {}))
+            body = json.dumps(obj).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                for k, v in extra.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                return
+            if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                body = gzip.compress(body)
+                gz = True
+            else:
+                gz = False
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            if gz:
+                self.send_header("Content-Encoding", "gzip")
+            for k, v in extra.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        rate_headers = {}
+
+        def admit(self):
+            status, self.rate_headers = stub.admit()
+            if status == 403:
+                self.send_json(403, {"message": "API rate limit exceeded"})
+            elif status:
+                self.send_json(status, {"message": "Server Error"})
+            return status is None
+
+        def do_GET(self):
+            if self.path == "/_stub/stats":
+                self.rate_headers = {}
+                return self.send_json(200, stub.stats())
+            if not self.admit():
+                return
+            u = urllib.parse.urlsplit(self.path)
+            q = dict(urllib.parse.parse_qsl(u.query))
+            parts = [p for p in u.path.split("/") if p]
+            host = f"http://{self.headers.get('Host')}"
+
+            if len(parts) == 2 and parts[0] == "users":
+                # logins starting with "org" are organizations (sweep auto-detection)
+                kind = "Organization" if parts[1].lower().startswith("org") else "User"
+                return self.send_json(200, {"login": parts[1], "type": kind})
+
+            if parts == ["user"]:
+                return self.send_json(200, {"login": stub.owner, "type": "User"})
+
+            if parts == ["user", "repos"]:
+                parts = ["users", stub.owner, "repos"]
+
+            if len(parts) == 3 and parts[0] in ("users", "orgs") and parts[2] == "repos":
+                per = int(q.get("per_page") or 30)
+                page = int(q.get("page") or 1)
+                last = max(1, -(-len(stub.repos) // per))
+                chunk = stub.repos[(page - 1) * per: page * per]
+                base = f"{host}/{parts[0]}/{parts[1]}/repos?type=owner&per_page={per}"
+                links = []
+                if page < last:
+                    links.append(f'<{base}&page={page + 1}>; rel="next"')
+                    links.append(f'<{base}&page={last}>; rel="last"')
+                if page > 1:
+                    links.append(f'<{base}&page=1>; rel="first"')
+                return self.send_json(200, chunk, {"Link": ", ".join(links)} if links else None)
+
+            if len(parts) >= 4 and parts[0] == "repos" and parts[2] in stub.by_name:
+                name = parts[2]
+                if parts[3] == "readme" or parts[3:] == ["contents", "README.md"]:
+                    raw = stub.readme(name)
+                    sha = stub.blob_oid(raw)
+                    return self.send_json(200, {"name": "README.md", "path": "README.md", "sha": sha,
+                                                "encoding": "base64", "content": base64.b64encode(raw).decode()})
+                if parts[3] == "contents":
+                    return self.send_json(404, {"message": "Not Found"})
+
+            return self.send_json(404, {"message": "Not Found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not self.admit():
+                return
+            if urllib.parse.urlsplit(self.path).path.rstrip("/") != "/graphql":
+                return self.send_json(404, {"message": "Not Found"})
+            return self.send_json(200, {"data": stub.graphql(payload.get("query") or "", payload.get("variables") or {})})
+
+    return Handler
+
+def serve(stub, port=0):
+    srv = ThreadingHTTPServer(("127.0.0.1", port), make_handler(stub))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_port}"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--owner", default="stub-owner")
+    ap.add_argument("--repos", type=int, default=100)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0)
+    ap.add_argument("--jitter-ms", type=float, default=0)
+    ap.add_argument("--rate-limit", type=int, default=0, help="requests per window; 0 sends no rate-limit headers")
+    ap.add_argument("--rate-window", type=int, default=3600)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    a = ap.parse_args()
+    stub = Stub(a.owner, a.repos, a.latency_ms, a.jitter_ms, a.rate_limit, a.rate_window, a.fail_rate, a.seed)
+    srv = ThreadingHTTPServer(("127.0.0.1", a.port), make_handler(stub))
+    print(f"stub listening on http://127.0.0.1:{srv.server_port}", file=sys.stderr, flush=True)
+    srv.serve_forever()
+
+if __name__ == "__main__":
+    main()
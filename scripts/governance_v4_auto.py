@@ -1,124 +1,291 @@
 #!/usr/bin/env python3
-import os, json, time, urllib.request, urllib.parse, urllib.error, sys
+import os, json, time, array, urllib.parse, http.client, sys
 from datetime import datetime, timezone
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import gh_client
+import http_cache
+import jsonl_stream
+import rate_limit
+import snapshot_store
+import metrics_history
+import pipeline
+import run_index
+import run_ledger
+import scoring
+import tracing
+from repo_record import RepoRecord
+
+MAX_RETRY_WAIT = 60  # seconds; a server-supplied Retry-After is capped to this
 
 def now_iso():
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
 
-def api_get(url, tok, tries=3):
-    """Production-grade API call with exponential backoff - GITHUB_TOKEN only."""
+def api_get(url, tok, tries=3, cache=None, client=None, priority=rate_limit.ENUMERATE, conditional=True):
+    """Production-grade API call with exponential backoff - GITHUB_TOKEN only.
+
+    Goes through the pooled keep-alive client, whose scheduler paces requests and
+    pauses on rate limits. With a cache, sends If-None-Match / If-Modified-Since and
+    serves 304s from disk; a 304 with no usable entry to serve is asked again once
+    without validators (conditional=False).
+    """
+    client = client or gh_client.default_client(tok)
+    entry = cache.lookup(url) if cache and conditional else None
     for i in range(tries):
         try:
-            req = urllib.request.Request(url)
-            req.add_header("Accept", "application/vnd.github+json")
-            req.add_header("X-GitHub-Api-Version", "2022-11-28")
-            if tok:
-                req.add_header("Authorization", f"Bearer {tok}")
-            
-            with urllib.request.urlopen(req, timeout=45) as resp:
-                data = resp.read().decode("utf-8", errors="replace")
-                return resp.status, dict(resp.headers), data
+            extra = cache.conditional_headers(entry) if cache else {}
+            status, hdrs, data = client.get(url, headers=extra, priority=priority)
         
-        except urllib.error.HTTPError as e:
-            status = e.code
-            if status == 401:
-                raise RuntimeError("HTTP 401: Token invalid. Ensure GITHUB_TOKEN is set.")
-            elif status == 403:
-                # Do NOT retry 403 - it won't succeed
-                raise RuntimeError(f"HTTP 403: Forbidden. Check API rate limits.")
-            elif status >= 500:
-                if i < tries - 1:
-                    wait_time = 2 ** i
-                    print(f"HTTP {status}: Server error. Retry in {wait_time}s...", file=sys.stderr)
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise RuntimeError(f"HTTP {status}: Server error after {tries} attempts.")
-            else:
-                raise RuntimeError(f"HTTP {status}: {e.reason}")
-        
-        except urllib.error.URLError as e:
+        except (OSError, http.client.HTTPException) as e:
             if i < tries - 1:
+                tracing.count("retries.network")
                 wait_time = 2 ** i
-                print(f"Network error: {e.reason}. Retry in {wait_time}s...", file=sys.stderr)
+                print(f"Network error: {e}. Retry in {wait_time}s...", file=sys.stderr)
                 time.sleep(wait_time)
                 continue
             else:
-                raise RuntimeError(f"Network error after {tries} attempts: {e.reason}")
+                raise RuntimeError(f"Network error after {tries} attempts: {e}")
         
-        except Exception as e:
+        if 200 <= status < 300:
+            if cache:
+                cache.miss()
+                if status == 200:
+                    cache.store(url, hdrs, data)
+            return status, hdrs, data
+        if status == 304 and entry and "body" in entry:
+            tracing.count("http.not_modified")
+            cached_hdrs, data = cache.hit(url, entry)
+            hdrs.update(cached_hdrs)
+            return 200, hdrs, data
+        if status == 304 and conditional:
+            # the entry behind the validators is gone (evicted, deleted, truncated)
+            tracing.count("retries.not_modified_without_entry")
+            return api_get(url, tok, tries, cache, client, priority, conditional=False)
+        if status == 401:
+            raise RuntimeError("HTTP 401: Token invalid. Ensure GITHUB_TOKEN is set.")
+        elif status in (403, 429):
+            # the client already paused and retried any rate-limit rejection
+            raise RuntimeError(f"HTTP {status}: Forbidden or still rate limited after pausing.")
+        elif status >= 500:
             if i < tries - 1:
-                wait_time = 2 ** i
-                print(f"Unexpected error: {e}. Retry in {wait_time}s...", file=sys.stderr)
+                tracing.count("retries.server_error")
+                # Retry-After may be an HTTP-date; fall back to backoff and cap either way
+                wait_time = min(rate_limit.parse_int(hdrs.get("Retry-After")) or 2 ** i, MAX_RETRY_WAIT)
+                print(f"HTTP {status}: Server error. Retry in {wait_time}s...", file=sys.stderr)
                 time.sleep(wait_time)
                 continue
             else:
-                raise RuntimeError(f"Unknown error after {tries} attempts: {e}")
+                raise RuntimeError(f"HTTP {status}: Server error after {tries} attempts.")
+        else:
+            raise RuntimeError(f"HTTP {status}: {http.client.responses.get(status, 'error')}")
     
     raise RuntimeError("Retry exhausted")
 
-def parse_next_link(link_hdr: str):
+def parse_links(link_hdr: str):
+    links = {}
     if not link_hdr:
-        return None
-    parts = [p.strip() for p in link_hdr.split(",")]
-    for p in parts:
-        if 'rel="next"' in p:
-            left = p.split(";")[0].strip()
-            if left.startswith("<") and left.endswith(">"):
-                return left[1:-1]
-    return None
-
-def list_repos(owner, tok):
-    """List repos using ONLY /users/{owner}/repos - no /user/repos dependency."""
+        return links
+    for p in link_hdr.split(","):
+        segs = [x.strip() for x in p.split(";")]
+        left = segs[0]
+        if not (left.startswith("<") and left.endswith(">")):
+            continue
+        for seg in segs[1:]:
+            if seg.startswith("rel="):
+                links[seg[4:].strip('"')] = left[1:-1]
+    return links
+
+def parse_next_link(link_hdr: str):
+    return parse_links(link_hdr).get("next")
+
+def page_urls(last_url, first=2):
+    """Expand a rel="last" URL into the URLs for pages first..last."""
+    parts = urllib.parse.urlsplit(last_url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    last = int(dict(query).get("page") or 1)
+    urls = []
+    for n in range(first, last + 1):
+        q = [(k, str(n) if k == "page" else v) for k, v in query]
+        urls.append(urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(q))))
+    return urls
+
+def fetch_page(url, tok, owner, cache=None):
+    with tracing.span("fetch_page"):
+        st, hdrs, body = api_get(url, tok, cache=cache)
+    if st != 200:
+        raise RuntimeError(f"HTTP {st} from {urllib.parse.urlsplit(url).path}")
+    
+    try:
+        arr = json.loads(body)
+    except Exception as e:
+        raise RuntimeError(f"JSON parse error: {e}")
+    
+    if isinstance(arr, dict) and "message" in arr:
+        raise RuntimeError(f"API error: {arr.get('message')}")
+    
+    if not isinstance(arr, list):
+        raise RuntimeError(f"Unexpected payload type: {type(arr)}")
+    
+    return arr, hdrs
+
+def merge_page(repos, arr):
+    seen = 0
+    for r in arr:
+        name = r.get("name")
+        if not name:
+            continue
+        repos[name] = RepoRecord.from_rest(r)
+        seen += 1
+    return seen
+
+def list_repos(owner, tok, cache=None, concurrency=None, kind="user"):
+    """List repos using ONLY /users/{owner}/repos (or /orgs/{owner}/repos for kind="org")
+    - no /user/repos dependency, unless kind="self": /user/repos?affiliation=owner, for a
+    token that belongs to the owner (the only listing that includes its private repos).
+
+    With concurrency > 1, pages 2..last (from the Link header) are fetched in parallel
+    and merged in page order, so the result matches the serial walk.
+    """
+    if concurrency is None:
+        concurrency = int(os.environ.get("LIST_CONCURRENCY") or "4")
+    with tracing.span("list_repos"):
+        return _list_repos(owner, tok, cache, concurrency, kind)
+
+def _list_repos(owner, tok, cache, concurrency, kind):
     repos = {}
-    next_url = f"https://api.github.com/users/{owner}/repos?type=owner&per_page=100"
+    if kind == "org":
+        path = f"orgs/{owner}/repos?type=all&per_page=100"
+    elif kind == "self":
+        path = "user/repos?affiliation=owner&per_page=100"
+    else:
+        path = f"users/{owner}/repos?type=owner&per_page=100"
+    next_url = gh_client.default_client(tok).url(path)
     seen = 0
+    pages = 0
+    
+    arr, hdrs = fetch_page(next_url, tok, owner, cache)
+    seen += merge_page(repos, arr)
+    pages += 1
+    links = parse_links(hdrs.get("Link", ""))
+    next_url = links.get("next")
+    
+    if next_url and concurrency > 1 and links.get("last"):
+        urls = page_urls(links["last"])
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(urls))) as pool:
+            results = list(pool.map(tracing.wrap(lambda u: fetch_page(u, tok, owner, cache)), urls))
+        for arr, hdrs in results:
+            seen += merge_page(repos, arr)
+            pages += 1
+        # the list may have grown while we were fetching; pick up any trailing pages serially
+        next_url = parse_next_link(results[-1][1].get("Link", "")) if results else None
     
     while next_url:
-        st, hdrs, body = api_get(next_url, tok)
-        if st != 200:
-            raise RuntimeError(f"HTTP {st} from /users/{owner}/repos")
-        
+        arr, hdrs = fetch_page(next_url, tok, owner, cache)
+        seen += merge_page(repos, arr)
+        pages += 1
+        next_url = parse_next_link(hdrs.get("Link", ""))
+    
+    return list(repos.values()), {"count": seen, "pages": pages}
+
+def parse_owners(spec):
+    """"a, org:b user:c" -> [("auto", "a"), ("org", "b"), ("user", "c")]."""
+    out = []
+    for tok in spec.replace(",", " ").split():
+        kind, _, login = tok.rpartition(":")
+        if login:
+            out.append((kind if kind in ("org", "user") else "auto", login))
+    return out
+
+def owner_kind(login, tok):
+    """"org" or "user" from GET /users/{login} (one request)."""
+    st, _, body = api_get(gh_client.default_client(tok).url(f"users/{login}"), tok)
+    if st != 200:
+        raise RuntimeError(f"HTTP {st} from /users/{login}")
+    return "org" if json.loads(body).get("type") == "Organization" else "user"
+
+def list_owners(owners, tok, cache=None, concurrency=None):
+    """Enumerate several owners at once. Every request goes through the one default
+    client, so they share its connection pool and rate-limit scheduler (one budget).
+    Returns [(login, kind, repos, meta)] in the order given."""
+    if concurrency is None:
+        concurrency = int(os.environ.get("SWEEP_CONCURRENCY") or "4")
+
+    def one(entry):
+        kind, login = entry
+        if kind == "auto":
+            kind = owner_kind(login, tok)
+        repos, meta = list_repos(login, tok, cache=cache, kind=kind)
+        return login, kind, repos, meta
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(owners)))) as pool:
+        return list(pool.map(tracing.wrap(one), owners))
+
+def change_key(r):
+    # archived/private feed the score too, so a flip there must re-score as well
+    return (r.get("pushed_at") or "", int(r.get("size_kb") or 0), int(r.get("open_issues") or 0),
+            bool(r.get("archived")), bool(r.get("private")))
+
+def load_previous(root):
+    """Newest earlier run's per-repo records, keyed by name (empty if none usable)."""
+    for d in snapshot_store.run_dirs(root):
         try:
-            arr = json.loads(body)
-        except Exception as e:
-            raise RuntimeError(f"JSON parse error: {e}")
-        
-        if isinstance(arr, dict) and "message" in arr:
-            raise RuntimeError(f"API error: {arr.get('message')}")
-        
-        if not isinstance(arr, list):
-            raise RuntimeError(f"Unexpected payload type: {type(arr)}")
-        
-        for r in arr:
-            name = r.get("name")
-            if not name:
+            if (d / "repo-intelligence-v4.jsonl").is_file():
+                recs = jsonl_stream.iter_records(d / "repo-intelligence-v4.jsonl")
+            elif snapshot_store.has_file(d, "repo-intelligence-v4.json"):
+                recs = snapshot_store.load_json(d).get("repos", [])
+            else:
                 continue
-            repos[name] = {
-                "name": name,
-                "private": bool(r.get("private", False)),
-                "archived": bool(r.get("archived", False)),
-                "open_issues": int(r.get("open_issues_count", 0) or 0),
-                "size_kb": int(r.get("size", 0) or 0),
-                "pushed_at": r.get("pushed_at") or "",
-                "default_branch": r.get("default_branch") or "main",
-                "html_url": r.get("html_url") or "",
-            }
-            seen += 1
-        
-        next_url = parse_next_link(hdrs.get("Link", ""))
+            return d, {x["name"]: x for x in recs if x.get("name")}
+        except Exception:
+            continue
+    return None, {}
+
+def dashboard_lines(owner, total, endpoint, meta, cache_stats, rate_stats, delta, highest):
+    lines = [
+        "# GOVERNANCE DASHBOARD v4 (AUTO)",
+        "",
+        f"Owner: {owner}",
+        f"Total repos: {total}",
+        "",
+        "## Enumeration",
+        f"- {endpoint}: {meta.get('count', 0)} ({meta.get('pages', 0)} pages)",
+        f"- token: GITHUB_TOKEN (workflow)",
+        f"- http cache: hits={cache_stats.get('hits', 0)} misses={cache_stats.get('misses', 0)} evictions={cache_stats.get('evictions', 0)}",
+        f"- requests: {rate_stats['requests']} | throttled: {rate_stats['throttled_s']}s | budget left: {rate_stats['budget_remaining']}",
+        "",
+    ]
     
-    return list(repos.values()), {"count": seen}
+    if delta is not None:
+        lines += [
+            "## Delta (incremental)",
+            f"- previous: {delta['previous']}",
+            f"- added={len(delta['added'])} changed={len(delta['changed'])} removed={len(delta['removed'])} unchanged={delta['unchanged']}",
+            "",
+        ]
+    
+    lines += [
+        "## Highest risk (top)",
+    ]
+    
+    for x in highest:
+        lines.append(f"- {x['name']} | tag={x['tag']} | private={x['private']} | archived={x['archived']} | issues={x['open_issues']} | size_kb={x['size_kb']}")
+    
+    lines.append("")
+    return lines
 
 def main():
     # Authentication guard
     tok = (os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or "").strip()
     
-    if not tok:
+    # a local stub (GH_API_BASE, see gh_stub.py) needs no token
+    if not tok and not os.environ.get("GH_API_BASE"):
         print("ERROR: GITHUB_TOKEN not found.", file=sys.stderr)
         sys.exit(1)
     
+    # spans + HTTP counters for timings.json; TRACE=0 turns them into no-ops
+    tracing.from_env()
+    
     # Self-test mode
     if "--self-test" in sys.argv:
         print("[SELF-TEST MODE]")
@@ -135,97 +302,169 @@ def main():
             print(f"Self-test FAILED: {e}", file=sys.stderr)
             sys.exit(1)
     
-    owner = os.environ.get("OWNER") or os.environ.get("GITHUB_REPOSITORY_OWNER") or ""
-    if not owner:
-        raise SystemExit("missing OWNER/GITHUB_REPOSITORY_OWNER")
-    
+    # sweep mode: OWNERS="a, org:b, user:c" (or --owners ...) enumerates all of them in
+    # one run; the merged files name repos "owner/repo", owners/<login>/ holds each one
+    sweep = os.environ.get("OWNERS") or (sys.argv[sys.argv.index("--owners") + 1] if "--owners" in sys.argv else "")
     top_n = int(os.environ.get("TOP_N") or "20")
+    cache = http_cache.from_env()
     
-    repos, meta = list_repos(owner, tok)
-    
-    def tag(r):
-        return "ACTIVE" if r.get("pushed_at") else "UNKNOWN"
-    
-    items = []
-    for r in repos:
-        items.append({
-            "name": r["name"],
-            "private": r["private"],
-            "archived": r["archived"],
-            "open_issues": r["open_issues"],
-            "size_kb": r["size_kb"],
-            "tag": tag(r),
-            "url": r["html_url"],
-        })
-    
-    def risk_key(x):
-        score = 0
-        if not x["archived"]: score += 5
-        if x["tag"] == "ACTIVE": score += 4
-        score += min(int(x["open_issues"]), 50) / 10.0
-        score += min(int(x["size_kb"]), 500000) / 100000.0
-        if x["private"]: score += 0.5
-        return -score
-    
-    highest = sorted(items, key=risk_key)[:top_n]
+    with tracing.span("enumerate"):
+        spans = []
+        if sweep:
+            owners = parse_owners(sweep)
+            if not owners:
+                raise SystemExit("OWNERS is empty")
+            repos = []
+            meta = {"count": 0, "pages": 0}
+            for login, kind, rs, m in list_owners(owners, tok, cache=cache):
+                lo = len(repos)
+                repos += [RepoRecord.from_dict(dict(r.to_dict(), name=f"{login}/{r.name}")) for r in rs]
+                spans.append((login, kind, lo, len(repos), m))
+                meta["count"] += m["count"]
+                meta["pages"] += m["pages"]
+            owner = ",".join(sp[0] for sp in spans)
+            endpoint = f"sweep of {len(spans)} owners"
+        else:
+            owner = os.environ.get("OWNER") or os.environ.get("GITHUB_REPOSITORY_OWNER") or ""
+            if not owner:
+                raise SystemExit("missing OWNER/GITHUB_REPOSITORY_OWNER")
+            kind = "org" if owner.startswith("org:") else "user"
+            owner = owner.split(":", 1)[-1]
+            repos, meta = list_repos(owner, tok, cache=cache, kind=kind)
+            endpoint = "/orgs/{owner}/repos" if kind == "org" else "/users/{owner}/repos"
+        if cache:
+            cache.evict()  # once per run, not per stored response
+        cache_stats = cache.stats() if cache else {}
+        rate_stats = gh_client.default_client(tok).scheduler.snapshot()
+    
+    incremental = "--incremental" in sys.argv or os.environ.get("INCREMENTAL") == "1"
+    with tracing.span("load_previous"):
+        prev_dir, prev = load_previous(Path("STATE/governance-v4")) if incremental else (None, {})
     
     out_dir = Path("STATE/governance-v4") / now_iso()
     out_dir.mkdir(parents=True, exist_ok=True)
     
     out_raw = out_dir / "raw.json"
     out_json = out_dir / "repo-intelligence-v4.json"
+    out_jsonl = out_dir / "repo-intelligence-v4.jsonl"
     out_md = out_dir / "dashboard-v4.md"
+    # the enumerated records as listed; pipeline.py --run classifies from these
+    out_inventory = out_dir / "inventory.jsonl"
     
-    out_raw.write_text(json.dumps({
-        "generated": now_iso(),
-        "owner": owner,
-        "token_present": bool(tok),
-        "repo_count": len(items),
-    }, ensure_ascii=False, indent=2), encoding="utf-8")
-    
-    out_json.write_text(json.dumps({
-        "generated": now_iso(),
-        "owner": owner,
-        "total": len(items),
-        "repos": items,
-        "highest_risk": highest,
-    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    # tag + score through the shared pipeline stages (one columnar pass); top-N by
+    # partial selection. The incremental reuse below replaces the stage cache here.
+    with tracing.span("scoring"):
+        pl = pipeline.Pipeline(owner, repos, root=None)
+        pl.execute(["score"])
+        scores = array.array("d", (row["risk_score"] for row in pl.rows("score")))
+        top_idx = scoring.top_n(scores, top_n)
+        top_set = set(top_idx)
+        owner_top = [[lo + i for i in scoring.top_n(scores[lo:hi], top_n)] for _, _, lo, hi, _ in spans]
+        for t in owner_top:
+            top_set.update(t)
+    with tracing.span("write_records"):
+        owner_writers = []
+        for login, _, _, _, _ in spans:
+            (out_dir / "owners" / login).mkdir(parents=True, exist_ok=True)
+            owner_writers.append(jsonl_stream.JsonlWriter(out_dir / "owners" / login / "repo-intelligence-v4.jsonl",
+                                                          {"generated": now_iso(), "owner": login}))
     
-    lines = [
-        "# GOVERNANCE DASHBOARD v4 (AUTO)",
-        "",
-        f"Owner: {owner}",
-        f"Total repos: {len(items)}",
-        "",
-        "## Enumeration",
-        f"- /users/{{owner}}/repos: {meta.get('count', 0)}",
-        f"- token: GITHUB_TOKEN (workflow)",
-        "",
-        "## Highest risk (top)",
-    ]
+        # records are streamed to JSONL as they are produced; only the top-N items,
+        # the name set and the changed list stay in memory
+        writer = jsonl_stream.JsonlWriter(out_jsonl, {"generated": now_iso(), "owner": owner})
+        inventory = jsonl_stream.JsonlWriter(out_inventory, {"generated": now_iso(), "owner": owner,
+                                                             "owners": [sp[0] for sp in spans] or [owner]})
+        names = set()
+        changed = []
+        top = {}
+        for idx, r in enumerate(repos):
+            old = prev.get(r["name"])
+            if old is not None and change_key(old) == change_key(r) and "risk_score" in old:
+                item = old
+            else:
+                item = r.to_item(round(scores[idx], 4))
+                changed.append(r["name"])
+            writer.write(item)
+            inventory.write(r.to_dict())
+            names.add(item["name"])
+            if idx in top_set:
+                top[idx] = item
+            for (login, _, lo, hi, _), w in zip(spans, owner_writers):
+                if lo <= idx < hi:
+                    w.write(dict(item, name=item["name"][len(login) + 1:]))
+                    break
+        total = writer.count
     
-    for x in highest:
-        lines.append(f"- {x['name']} | tag={x['tag']} | private={x['private']} | archived={x['archived']} | issues={x['open_issues']} | size_kb={x['size_kb']}")
+        highest = [top[i] for i in top_idx]
+        writer.close({"total": total, "highest_risk": highest})
+        inventory.close({"total": total})
+        for (login, _, _, _, _), w, t in zip(spans, owner_writers, owner_top):
+            w.close({"total": w.count, "highest_risk": [dict(top[i], name=top[i]["name"][len(login) + 1:]) for i in t]})
     
-    lines.append("")
-    out_md.write_text("\n".join(lines), encoding="utf-8")
+        if incremental:
+            added = sorted(n for n in changed if n not in prev)
+            delta = {
+                "generated": now_iso(),
+                "owner": owner,
+                "previous": prev_dir.name if prev_dir else None,
+                "added": added,
+                "changed": sorted(n for n in changed if n in prev),
+                "removed": sorted(n for n in prev if n not in names),
+                "unchanged": total - len(changed),
+            }
+            (out_dir / "delta.json").write_text(json.dumps(delta, ensure_ascii=False, indent=2), encoding="utf-8")
+    
+    with tracing.span("write_views"):
+        out_raw.write_text(json.dumps({
+            "generated": now_iso(),
+            "owner": owner,
+            "token_present": bool(tok),
+            "repo_count": total,
+            "http_cache": cache_stats,
+            "rate_limit": rate_stats,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+    
+        # pretty-printed document kept as a derived view for the dashboard and readers
+        jsonl_stream.write_pretty_view(out_jsonl, out_json, order=["generated", "owner", "total", "repos", "highest_risk"])
+    
+    with tracing.span("dashboard"):
+        lines = dashboard_lines(owner, total, endpoint, meta, cache_stats, rate_stats, delta if incremental else None, highest)
+        if spans:
+            at = lines.index("## Highest risk (top)")
+            lines[at:at] = ["## Owners"] + [
+                f"- {login} ({kind}) | repos={hi - lo} | owners/{login}/dashboard-v4.md" for login, kind, lo, hi, _ in spans
+            ] + [""]
+        lines += tracing.dashboard_lines()
+        out_md.write_text("\n".join(lines), encoding="utf-8")
+    
+    with tracing.span("owner_views"):
+        for login, kind, lo, hi, m in spans:
+            od = out_dir / "owners" / login
+            jsonl_stream.write_pretty_view(od / "repo-intelligence-v4.jsonl", od / "repo-intelligence-v4.json",
+                                           order=["generated", "owner", "total", "repos", "highest_risk"])
+            ep = "/orgs/{owner}/repos" if kind == "org" else "/users/{owner}/repos"
+            (od / "dashboard-v4.md").write_text("\n".join(dashboard_lines(
+                login, hi - lo, ep, m, cache_stats, rate_stats, None,
+                jsonl_stream.read_footer(od / "repo-intelligence-v4.jsonl")["highest_risk"])), encoding="utf-8")
     
-    # Append to RULES.md
-    rules = Path("RULES.md")
-    rules.touch(exist_ok=True)
-    mark = "### GOVERNANCE (AUTO)"
-    txt = rules.read_text(encoding="utf-8", errors="replace")
+    # written before the run is indexed and stored so timings.json is part of the snapshot
+    # (the history/snapshot spans themselves are therefore not in it)
+    if tracing.enabled():
+        tracing.write(out_dir / "timings.json")
     
-    if mark not in txt:
-        txt += "\n\n" + mark + "\n- Runs recorded below.\n"
+    with tracing.span("history"):
+        run_index.add_run(out_dir)
+        metrics_history.record_run(out_dir)
     
-    txt += (
-        f"\n- {now_iso()} | governance_v4_auto.py (GITHUB_TOKEN only)\n"
-        f"  - total_repos={len(items)} top_n={top_n}\n"
-        f"  - outputs: {out_json}, {out_md}\n"
-    )
+    # older runs keep only a manifest of content-addressed blobs; this run stays in full
+    with tracing.span("snapshot_store"):
+        snapshot_store.store_run(out_dir)
+        if os.environ.get("SNAPSHOT_COMPACT") != "0":
+            snapshot_store.compact(keep=int(os.environ.get("SNAPSHOT_KEEP_FULL") or "1"))
     
-    rules.write_text(txt, encoding="utf-8")
+    # one append-only ledger line per run; RULES.md is rendered from it on demand
+    run_ledger.append("governance", run=out_dir.name, owner=owner, total_repos=total, top_n=top_n,
+                      owners=[sp[0] for sp in spans], outputs=[str(out_json), str(out_md)])
     print("OK")
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Batch repo inventory over the GraphQL API.
+
+One query returns metadata, default branch, RULES.md / README presence and the
+README blob OID for up to 100 repos, replacing the per-repo REST contents calls.
+The README is looked up under the same names REST /readme accepts (README_PATHS,
+first hit wins), so both paths agree on readme_oid.
+
+  python scripts/graphql_inventory.py OWNER            # list_repos() shape
+  python scripts/graphql_inventory.py OWNER --gh-json  # `gh repo list --json` shape (build_v4.py input)
+"""
+import os, sys, json
+
+import gh_client
+import rate_limit
+from repo_record import RepoRecord
+
+# .github/, root, docs/ - the order GitHub surfaces a README in
+README_PATHS = (".github/README.md", "README.md", "readme.md", "Readme.md", "README.markdown",
+                "README.rst", "README.txt", "README", "docs/README.md")
+
+def _readme_fields(fields):
+    return " ".join(f'readme{i}: object(expression: "HEAD:{p}") {{ ... on Blob {{ {fields} }} }}'
+                    for i, p in enumerate(README_PATHS))
+
+def _readme(n):
+    """First README_PATHS blob present on a node, or None."""
+    return next((n[k] for k in (f"readme{i}" for i in range(len(README_PATHS))) if n.get(k)), None)
+
+INVENTORY_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name isPrivate isArchived description url pushedAt updatedAt diskUsage
+        openIssues: issues(states: OPEN) { totalCount }
+        openPulls: pullRequests(states: OPEN) { totalCount }
+        defaultBranchRef { name }
+        rules: object(expression: "HEAD:RULES.md") { ... on Blob { oid } }
+        %s
+      }
+    }
+  }
+}
+""" % _readme_fields("oid")
+
+def graphql(client, query, variables=None, priority=rate_limit.ENUMERATE):
+    st, _, body = client.request("POST", "graphql", body={"query": query, "variables": variables or {}}, priority=priority)
+    if st != 200:
+        raise RuntimeError(f"HTTP {st} from /graphql")
+    try:
+        data = json.loads(body)
+    except Exception as e:
+        raise RuntimeError(f"JSON parse error: {e}")
+    if data.get("errors") and not data.get("data"):
+        raise RuntimeError(f"GraphQL error: {data['errors'][0].get('message')}")
+    return data.get("data") or {}
+
+def node_to_repo(n):
+    """Map a GraphQL repository node onto the list_repos() record shape."""
+    return RepoRecord.from_graphql(dict(n, readme=_readme(n)))
+
+def to_gh_json(r):
+    """list_repos() record -> `gh repo list --json name,url,...` record (build_v4.py input)."""
+    return r.to_gh_json()
+
+def list_repos_graphql(owner, client, page_size=None):
+    page_size = min(int(page_size or os.environ.get("GRAPHQL_PAGE") or "50"), 100)
+    repos = {}
+    after = None
+    pages = 0
+    while True:
+        data = graphql(client, INVENTORY_QUERY, {"login": owner, "first": page_size, "after": after})
+        owner_node = data.get("repositoryOwner")
+        if owner_node is None:
+            raise RuntimeError(f"Unknown owner: {owner}")
+        conn = owner_node["repositories"]
+        for n in conn.get("nodes") or []:
+            if n and n.get("name"):
+                repos[n["name"]] = node_to_repo(n)
+        pages += 1
+        info = conn.get("pageInfo") or {}
+        if not info.get("hasNextPage"):
+            break
+        after = info.get("endCursor")
+    return list(repos.values()), {"count": len(repos), "requests": pages}
+
+def fetch_readmes(client, owner, names, batch=50):
+    """README text for many repos, one aliased query per batch. Returns {name: text or None}."""
+    out = {}
+    for i in range(0, len(names), batch):
+        chunk = names[i:i + batch]
+        parts = []
+        for j, name in enumerate(chunk):
+            parts.append(
+                f"r{j}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                "{ " + _readme_fields("oid text") + " }"
+            )
+        data = graphql(client, "query {\n" + "\n".join(parts) + "\n}", priority=rate_limit.README)
+        for j, name in enumerate(chunk):
+            out[name] = (_readme(data.get(f"r{j}") or {}) or {}).get("text")
+    return out
+
+def main():
+    if len(sys.argv) < 2:
+        raise SystemExit("usage: graphql_inventory.py OWNER [--gh-json]")
+    owner = sys.argv[1]
+    client = gh_client.default_client(gh_client.resolve_token())
+    repos, meta = list_repos_graphql(owner, client)
+    if "--gh-json" in sys.argv:
+        print(json.dumps([to_gh_json(r) for r in repos], ensure_ascii=False))
+    else:
+        print(json.dumps([r.to_dict() for r in repos], ensure_ascii=False))
+    print(f"graphql: {meta['count']} repos in {meta['requests']} requests", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import os, json, time, hashlib, threading
+from pathlib import Path
+
+DEFAULT_DIR = "STATE/http-cache"
+
+class HttpCache:
+    """On-disk conditional-request cache (ETag / Last-Modified), keyed by URL.
+
+    Entry sizes and access times are tracked in memory (the directory is listed once);
+    evict() runs at the end of a run, or mid-run only once the cache is twice over budget.
+    """
+
+    def __init__(self, root=DEFAULT_DIR, max_entries=500, max_bytes=20 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index = None  # file name -> [atime, size], loaded on first use
+        self._bytes = 0
+
+    def _entries(self):
+        if self._index is None:
+            self._index = {}
+            try:
+                for f in self.root.glob("*.json"):
+                    st = f.stat()
+                    self._index[f.name] = [st.st_mtime, st.st_size]
+            except OSError:
+                pass
+            self._bytes = sum(e[1] for e in self._index.values())
+        return self._index
+
+    def _path(self, url):
+        return self.root / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:40] + ".json")
+
+    def lookup(self, url):
+        p = self._path(url)
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if entry.get("url") != url:
+            return None
+        return entry
+
+    def conditional_headers(self, entry):
+        hdrs = {}
+        if not entry:
+            return hdrs
+        if entry.get("etag"):
+            hdrs["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            hdrs["If-Modified-Since"] = entry["last_modified"]
+        return hdrs
+
+    def hit(self, url, entry):
+        p = self._path(url)
+        with self._lock:
+            self.hits += 1
+            e = self._entries().get(p.name)
+            if e is not None:
+                e[0] = time.time()
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return entry.get("headers") or {}, entry.get("body") or ""
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self, url, headers, body):
+        etag = headers.get("ETag") or ""
+        last_mod = headers.get("Last-Modified") or ""
+        if not etag and not last_mod:
+            return
+        keep = {k: v for k, v in headers.items() if k.lower() in ("link", "etag", "last-modified", "content-type")}
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_mod,
+            "stored": int(time.time()),
+            "headers": keep,
+            "body": body,
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        p = self._path(url)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp = p.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+        with self._lock:
+            self.stores += 1
+            idx = self._entries()
+            old = idx.get(p.name)
+            self._bytes += len(data) - (old[1] if old else 0)
+            idx[p.name] = [time.time(), len(data)]
+            over = len(idx) > 2 * self.max_entries or self._bytes > 2 * self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries until under max_entries and max_bytes."""
+        with self._lock:
+            idx = self._entries()
+            files = sorted((a, size, name) for name, (a, size) in idx.items())
+            files.reverse()  # pop() takes the least recently used
+            while files and (len(idx) > self.max_entries or self._bytes > self.max_bytes):
+                _, size, name = files.pop()
+                try:
+                    (self.root / name).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    continue
+                del idx[name]
+                self._bytes -= size
+                self.evictions += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+def from_env():
+    if (os.environ.get("HTTP_CACHE") or "1") == "0":
+        return None
+    return HttpCache(
+        root=os.environ.get("HTTP_CACHE_DIR") or DEFAULT_DIR,
+        max_entries=int(os.environ.get("HTTP_CACHE_MAX_ENTRIES") or "500"),
+        max_bytes=int(os.environ.get("HTTP_CACHE_MAX_BYTES") or str(20 * 1024 * 1024)),
+    )
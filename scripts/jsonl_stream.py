@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Streamed JSON Lines output for repo-intelligence documents.
+
+Layout: a {"$header": {...}} line, one compact line per record, then a
+{"$footer": {...}} line for values only known at the end (totals, top-N).
+Readers iterate records lazily; the pretty-printed JSON is derived from the
+stream, also without holding the records in memory.
+"""
+import os, json
+from pathlib import Path
+
+def _line(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+class JsonlWriter:
+    def __init__(self, path, header):
+        self.path = Path(path)
+        self.tmp = self.path.with_name(self.path.name + ".tmp")
+        self.f = self.tmp.open("w", encoding="utf-8")
+        self.count = 0
+        self.f.write(_line({"$header": header}) + "\n")
+
+    def write(self, rec):
+        self.f.write(_line(rec) + "\n")
+        self.count += 1
+
+    def close(self, footer=None):
+        self.f.write(_line({"$footer": footer or {}}) + "\n")
+        self.f.close()
+        os.replace(self.tmp, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *a):
+        if exc_type is None:
+            if not self.f.closed:
+                self.close()
+        else:
+            self.f.close()
+            self.tmp.unlink(missing_ok=True)
+
+def _meta(path, key):
+    with Path(path).open(encoding="utf-8") as f:
+        if key == "$header":
+            return json.loads(f.readline()).get(key, {})
+        last = None
+        for last in f:
+            pass
+        return json.loads(last).get(key, {}) if last else {}
+
+def read_header(path):
+    return _meta(path, "$header")
+
+def read_footer(path):
+    return _meta(path, "$footer")
+
+def iter_records(path):
+    with Path(path).open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            if "$header" in obj or "$footer" in obj:
+                continue
+            yield obj
+
+def _pretty(v, level):
+    # json.dumps(indent=2) output re-based at `level`; matches a whole-document dump
+    return json.dumps(v, ensure_ascii=False, indent=2).replace("\n", "\n" + "  " * level)
+
+def write_pretty_view(jsonl_path, out_path, list_key="repos", order=None):
+    """Derive the indent=2 JSON document from a JSONL stream, byte-identical to
+    json.dumps(doc, ensure_ascii=False, indent=2) of the equivalent in-memory doc."""
+    header = read_header(jsonl_path)
+    footer = read_footer(jsonl_path)
+    fields = dict(header)
+    fields.update(footer)
+    keys = list(order) if order else list(header) + [list_key] + list(footer)
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write("{")
+        for i, k in enumerate(keys):
+            f.write("," if i else "")
+            f.write("\n  " + json.dumps(k, ensure_ascii=False) + ": ")
+            if k == list_key:
+                first = True
+                for rec in iter_records(jsonl_path):
+                    f.write(("[" if first else ",") + "\n    " + _pretty(rec, 2))
+                    first = False
+                f.write("[]" if first else "\n  ]")
+            else:
+                f.write(_pretty(fields.get(k), 1))
+        f.write("\n}" if keys else "}")
+    os.replace(tmp, out_path)
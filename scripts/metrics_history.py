@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Columnar per-repo metric history across governance runs.
+
+One fixed-width little-endian file per column under STATE/metrics-history, plus a
+repo-name dictionary. Rows are appended in run order, so the ts column is sorted and
+time slices are a binary search over a memory-mapped column; nothing is JSON-parsed.
+The two risk scales are kept apart: risk_score is the governance score (0-15),
+build_risk the build_v4 risk (0-10); a run that has only one leaves the other NaN.
+
+  python scripts/metrics_history.py --backfill [--rebuild]
+  python scripts/metrics_history.py query REPO [--since ISO] [--until ISO]
+"""
+import os, sys, json, mmap, array, bisect
+from datetime import datetime, timezone
+from pathlib import Path
+
+import snapshot_store
+import jsonl_stream
+import run_index
+
+ROOT = Path("STATE/metrics-history")
+# column name -> array typecode (fixed width on every platform CPython supports)
+COLUMNS = {"ts": "q", "repo": "I", "open_issues": "I", "size_kb": "I", "risk_score": "f", "build_risk": "f",
+           "flags": "B"}
+ARCHIVED, PRIVATE = 1, 2
+NAN = float("nan")
+# the single mixed-scale column older histories had
+LEGACY = "risk.f"
+
+def record_risks(x):
+    """(governance risk_score, build_v4 risk) of one record; NaN where the run has no such value."""
+    if "risk_score" in x:
+        score = float(x["risk_score"])
+    elif {"archived", "tag", "open_issues", "size_kb", "private"} <= set(x):
+        from scoring import risk_score
+        score = float(risk_score(x))
+    else:
+        score = NAN
+    return score, float(x["risk"]) if "risk" in x else NAN
+
+def _num(v):
+    return None if v != v else round(v, 4)
+
+class History:
+    def __init__(self, root=ROOT):
+        self.root = Path(root)
+        self.names_path = self.root / "repos.json"
+        self.names = json.loads(self.names_path.read_text(encoding="utf-8")) if self.names_path.exists() else []
+        self.ids = {n: i for i, n in enumerate(self.names)}
+        self._maps = []
+
+    def _check_layout(self):
+        if (self.root / LEGACY).exists():
+            raise RuntimeError(f"{self.root} mixes both risk scales in one column; "
+                               "rebuild it with: metrics_history.py --backfill --rebuild")
+
+    def close(self):
+        for f, m in self._maps:
+            m.close()
+            f.close()
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _col_path(self, col):
+        return self.root / f"{col}.{COLUMNS[col]}"
+
+    def last_ts(self):
+        p = self._col_path("ts")
+        if not p.exists() or p.stat().st_size < 8:
+            return None
+        with p.open("rb") as f:
+            f.seek(-8, os.SEEK_END)
+            a = array.array("q")
+            a.frombytes(f.read(8))
+            return a[0]
+
+    def append_run(self, ts, records):
+        """Append one run's records; a run not newer than the last one stored is skipped."""
+        ts = int(ts)
+        self._check_layout()
+        last = self.last_ts()
+        if last is not None and ts <= last:
+            return 0
+        cols = {c: array.array(t) for c, t in COLUMNS.items()}
+        for x in records:
+            name = x.get("name")
+            if not name:
+                continue
+            if name not in self.ids:
+                self.ids[name] = len(self.names)
+                self.names.append(name)
+            cols["ts"].append(ts)
+            cols["repo"].append(self.ids[name])
+            cols["open_issues"].append(max(int(x.get("open_issues") or 0), 0))
+            cols["size_kb"].append(max(int(x.get("size_kb") or 0), 0))
+            score, build = record_risks(x)
+            cols["risk_score"].append(score)
+            cols["build_risk"].append(build)
+            cols["flags"].append((ARCHIVED if x.get("archived") else 0) | (PRIVATE if x.get("private") else 0))
+        if not cols["ts"]:
+            return 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.names_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.names, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.names_path)
+        for c, a in cols.items():
+            with self._col_path(c).open("ab") as f:
+                a.tofile(f)
+        return len(cols["ts"])
+
+    def _column(self, col):
+        p = self._col_path(col)
+        if not p.exists() or p.stat().st_size == 0:
+            return memoryview(b"").cast(COLUMNS[col])
+        f = p.open("rb")
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append((f, m))
+        return memoryview(m).cast(COLUMNS[col])
+
+    def rows(self, since=None, until=None):
+        """Row range [lo, hi) for since <= ts <= until (epoch seconds)."""
+        ts = self._column("ts")
+        lo = bisect.bisect_left(ts, since) if since is not None else 0
+        hi = bisect.bisect_right(ts, until) if until is not None else len(ts)
+        return lo, hi
+
+    def query(self, repo=None, since=None, until=None):
+        """Yields dicts for one repo (or all repos) within the time range."""
+        self._check_layout()
+        lo, hi = self.rows(since, until)
+        cols = {c: self._column(c) for c in COLUMNS}
+        want = self.ids.get(repo) if repo is not None else None
+        if repo is not None and want is None:
+            return
+        repo_col = cols["repo"]
+        for i in range(lo, hi):
+            rid = repo_col[i]
+            if want is not None and rid != want:
+                continue
+            flags = cols["flags"][i]
+            yield {
+                "ts": datetime.fromtimestamp(cols["ts"][i], timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "name": self.names[rid],
+                "open_issues": cols["open_issues"][i],
+                "size_kb": cols["size_kb"][i],
+                "risk_score": _num(cols["risk_score"][i]),
+                "build_risk": _num(cols["build_risk"][i]),
+                "archived": bool(flags & ARCHIVED),
+                "private": bool(flags & PRIVATE),
+            }
+
+def record_run(run_dir, history=None):
+    h = history or History()
+    dt = run_index.parse_run_ts(Path(run_dir).name)
+    if dt is None:
+        return 0
+    stream = Path(run_dir) / "repo-intelligence-v4.jsonl"
+    if stream.is_file():
+        return h.append_run(dt.timestamp(), jsonl_stream.iter_records(stream))
+    if not snapshot_store.has_file(run_dir, "repo-intelligence-v4.json"):
+        return 0
+    doc = snapshot_store.load_json(run_dir)
+    return h.append_run(dt.timestamp(), doc.get("repos") or [])
+
+def backfill(root=run_index.ROOT, history=None, rebuild=False):
+    if rebuild:
+        hroot = history.root if history else ROOT
+        if history:
+            history.close()
+        for p in list(hroot.glob("*")) if hroot.is_dir() else []:
+            p.unlink()
+        history = History(hroot)
+    h = history or History()
+    runs = run_index.ordered(root, newest_first=False)
+    rows = 0
+    for d in runs:
+        try:
+            rows += record_run(d, h)
+        except Exception as e:
+            print(f"skip {d}: {e}", file=sys.stderr)
+    return {"runs": len(runs), "rows": rows, "repos": len(h.names)}
+
+def _iso_arg(args, flag):
+    if flag not in args:
+        return None
+    v = args[args.index(flag) + 1]
+    return datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp()
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--backfill"]:
+        print(json.dumps(backfill(rebuild="--rebuild" in args)))
+    elif args[:1] == ["query"] and len(args) >= 2:
+        with History() as h:
+            for row in h.query(args[1], _iso_arg(args, "--since"), _iso_arg(args, "--until")):
+                print(json.dumps(row, ensure_ascii=False))
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Batched MOVE ONLY engine: plan entries -> TRASH, with an undo manifest.
+
+Plain paths (relative, or absolute under root) are checked directly and taken
+literally even when their names contain glob characters; the tree is walked once,
+and only when a glob has to be expanded. Entries already covered by a listed
+directory are dropped, each destination directory is created once, and name
+clashes in the destination get a __N suffix. Nothing is ever deleted.
+
+  python scripts/move_engine.py move --dest TRASH/TS [--root .] [--flatten]
+                                     [--list FILE] [--manifest OUT] [--dry-run] [PATH...]
+  python scripts/move_engine.py undo MANIFEST
+  python scripts/move_engine.py --bench 50000
+"""
+import os, re, sys, json, time, shutil, tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+GLOB_CHARS = set("*?[")
+
+def _glob_re(pat):
+    """Shell-style glob -> regex over '/'-separated relative paths; ** spans directories."""
+    out, i = [], 0
+    while i < len(pat):
+        c = pat[i]
+        if pat.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pat.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pat.find("]", i + 2 if pat[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+def _norm(entry, root=None):
+    """Entry -> path relative to root, or None when it is empty or outside root.
+    Absolute entries under root (trash-move.sh passes whatever it is given) are kept."""
+    p = entry.strip()
+    if root is not None and os.path.isabs(p):
+        p = os.path.relpath(os.path.abspath(p), os.path.abspath(root))
+    p = p.replace("\\", "/")
+    while p.startswith("./"):
+        p = p[2:]
+    p = p.rstrip("/")
+    if not p or p.startswith("/"):
+        return None
+    p = os.path.normpath(p).replace(os.sep, "/")
+    if p == "." or p == ".." or p.startswith("../"):
+        return None
+    return p
+
+def _is_git(rel):
+    return rel == ".git" or rel.startswith(".git/") or "/.git/" in rel or rel.endswith("/.git")
+
+def walk(root, exclude=()):
+    """Every relative path under root (files, links and dirs) in one os.walk; .git and
+    excluded subtrees are pruned."""
+    root = str(root)
+    exclude = {e.rstrip("/") for e in exclude if e}
+    paths = set()
+    cut = len(root.rstrip(os.sep)) + 1
+    for dp, dns, fns in os.walk(root):
+        base = dp[cut:].replace(os.sep, "/") if len(dp) >= cut else ""
+        keep = []
+        for d in dns:
+            rel = base + "/" + d if base else d
+            if d == ".git" or rel in exclude:
+                continue
+            paths.add(rel)
+            keep.append(d)
+        dns[:] = keep
+        for f in fns:
+            paths.add(base + "/" + f if base else f)
+    return paths
+
+def plan_moves(root, entries, dest="TRASH", flatten=False):
+    """Returns {"moves": [(src, dst)], "missing": [...], "skipped": [...]} (paths relative to root).
+
+    flatten puts every entry directly in dest (trash-move.sh); otherwise the
+    relative path is kept under dest (safe-clean.sh, apply)."""
+    root = Path(root)
+    dest = _norm(dest, root) or "TRASH"
+    existing = None  # walked only when a glob has to be expanded
+    selected, missing, skipped = set(), [], []
+    for raw in entries:
+        if not raw.strip():
+            continue
+        rel = _norm(raw, root)
+        if rel is None:
+            skipped.append({"path": raw.strip(), "reason": "outside_root"})
+            continue
+        if _is_git(rel):
+            skipped.append({"path": rel, "reason": "git_internals"})
+            continue
+        if rel == dest or rel.startswith(dest + "/"):
+            skipped.append({"path": rel, "reason": "inside_dest"})
+            continue
+        # a path that exists is taken literally, even when its name has glob characters
+        if os.path.lexists(root / rel):
+            selected.add(rel)
+        elif GLOB_CHARS & set(rel):
+            if existing is None:
+                existing = walk(root, exclude=[dest])
+            rx = _glob_re(rel)
+            hits = [p for p in existing if rx.match(p)]
+            if hits:
+                selected.update(hits)
+            else:
+                missing.append(rel)
+        else:
+            missing.append(rel)
+
+    # drop entries covered by a selected ancestor directory (sorted order puts parents first)
+    moves, kept = [], []
+    taken = set()
+    for rel in sorted(selected):
+        parts = rel.split("/")
+        if any("/".join(parts[:k]) in selected for k in range(1, len(parts))):
+            continue
+        kept.append(rel)
+    for rel in kept:
+        dst = dest + "/" + (rel.rsplit("/", 1)[-1] if flatten else rel)
+        if dst in taken or os.path.lexists(root / dst):
+            stem, dot, ext = dst.rpartition(".")
+            if not dot or "/" in ext or not stem or stem.endswith("/"):
+                stem, dot, ext = dst, "", ""
+            n = 2
+            while True:
+                cand = f"{stem}__{n}{dot}{ext}"
+                if cand not in taken and not os.path.lexists(root / cand):
+                    dst = cand
+                    break
+                n += 1
+        taken.add(dst)
+        moves.append((rel, dst))
+    return {"moves": moves, "missing": missing, "skipped": skipped}
+
+def execute(root, plan, manifest=None, meta=None):
+    """Create each destination parent once, rename, and write the undo manifest."""
+    root = Path(root)
+    for parent in sorted({os.path.dirname(dst) for _, dst in plan["moves"]}):
+        os.makedirs(root / parent, exist_ok=True)
+    done = []
+    for src, dst in plan["moves"]:
+        try:
+            os.rename(root / src, root / dst)
+            done.append([src, dst])
+        except OSError as e:
+            plan["skipped"].append({"path": src, "reason": f"rename: {e.strerror}"})
+    doc = dict(meta or {})
+    doc.update({
+        "root": str(root.resolve()),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "moved": len(done),
+        "moves": done,
+        "missing": plan["missing"],
+        "skipped": plan["skipped"],
+    })
+    if manifest:
+        manifest = Path(manifest)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    return doc
+
+def undo(manifest):
+    doc = json.loads(Path(manifest).read_text(encoding="utf-8"))
+    root = Path(doc["root"])
+    restored, failed, made = 0, [], set()
+    for src, dst in reversed(doc["moves"]):
+        if os.path.lexists(root / src) or not os.path.lexists(root / dst):
+            failed.append(src)
+            continue
+        parent = os.path.dirname(src)
+        if parent not in made:
+            os.makedirs(root / parent, exist_ok=True)
+            made.add(parent)
+        os.rename(root / dst, root / src)
+        restored += 1
+    return {"restored": restored, "failed": failed}
+
+def move(root, entries, dest, flatten=False, manifest=None, meta=None, dry_run=False):
+    plan = plan_moves(root, entries, dest, flatten)
+    if dry_run:
+        return {"moved": 0, "moves": plan["moves"], "missing": plan["missing"], "skipped": plan["skipped"]}
+    return execute(root, plan, manifest, meta)
+
+def bench(n):
+    tmp = Path(tempfile.mkdtemp(prefix="move-bench-"))
+    try:
+        for i in range(n):
+            d = tmp / f"d{i // 1000:03d}" / f"s{i // 100 % 10}"
+            if i % 100 == 0:
+                d.mkdir(parents=True, exist_ok=True)
+            (d / f"f{i}.txt").write_bytes(b"x")
+        # every file listed, plus overlapping directory entries, globs and missing paths
+        entries = [f"d{i // 1000:03d}/s{i // 100 % 10}/f{i}.txt" for i in range(n)]
+        entries += ["d000", "d001/s3", "d002/*/f20*.txt", "missing/a.txt", ".git/config"]
+        t0 = time.perf_counter()
+        plan = plan_moves(tmp, entries, "TRASH/bench")
+        t1 = time.perf_counter()
+        doc = execute(tmp, plan, tmp / "manifest.json")
+        t2 = time.perf_counter()
+        u = undo(tmp / "manifest.json")
+        t3 = time.perf_counter()
+        return {"paths": len(entries), "moves": doc["moved"], "missing": len(doc["missing"]),
+                "plan_s": round(t1 - t0, 3), "execute_s": round(t2 - t1, 3), "undo_s": round(t3 - t2, 3),
+                "restored": u["restored"]}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def _opt(args, flag, default=None):
+    if flag in args:
+        i = args.index(flag)
+        v = args[i + 1]
+        del args[i:i + 2]
+        return v
+    return default
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        print(json.dumps(bench(int(args[1]) if len(args) > 1 else 50000)))
+    elif args[:1] == ["undo"] and len(args) == 2:
+        print(json.dumps(undo(args[1])))
+    elif args[:1] == ["move"]:
+        args = args[1:]
+        root = _opt(args, "--root", ".")
+        dest = _opt(args, "--dest")
+        lst = _opt(args, "--list")
+        manifest = _opt(args, "--manifest")
+        flatten = "--flatten" in args
+        dry = "--dry-run" in args
+        paths = [a for a in args if a not in ("--flatten", "--dry-run")]
+        if not dest:
+            raise SystemExit(__doc__)
+        entries = list(paths)
+        if lst:
+            entries += Path(lst).read_text(encoding="utf-8").splitlines()
+        doc = move(root, entries, dest, flatten, manifest, {"trash": dest}, dry)
+        for src, dst in doc["moves"]:
+            print(f"MOVED: {src} -> {dst}" if not dry else f"WOULD MOVE: {src} -> {dst}")
+        for m in doc["missing"]:
+            print(f"MISSING: {m}")
+        for s in doc["skipped"]:
+            print(f"SKIP ({s['reason']}): {s['path']}")
+        print(json.dumps({"moved": doc["moved"], "missing": len(doc["missing"]), "skipped": len(doc["skipped"])}), file=sys.stderr)
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Near-duplicate repo detection: shingling + MinHash + LSH banding.
+
+Each repo gets one MinHash signature per field (name character bigrams, description
+word shingles, README word shingles). LSH bands bucket repos whose signatures agree
+on a whole band; candidates are verified by estimated Jaccard and merged into
+clusters with union-find. Only repos sharing a bucket are compared, never all pairs
+of repos: a small bucket pair by pair, a large one (templated names such as
+repo-0001, repo-0002, ...) member against one representative per cluster, at most
+MAX_REPS of them, so work stays roughly linear in the number of repos.
+
+  python scripts/near_dup.py --bench 10000 100000
+"""
+import os, re, sys, json, time, array, base64, hashlib, random, operator
+from pathlib import Path
+
+K = 64                      # hash functions per signature
+BANDS, ROWS = 16, 4         # K = BANDS * ROWS; candidate threshold ~ (1/16)^(1/4) = 0.5
+THRESHOLDS = {"name": 0.5, "desc": 0.6, "readme": 0.7}
+MIN_SHINGLES = {"name": 1, "desc": 3, "readme": 5}   # short texts match by accident
+SIG_PATH = Path("STATE/near-dup-signatures.json")
+SMALL_BUCKET = 16           # up to this size every pair in a bucket is compared
+MAX_REPS = 16               # larger buckets: representatives checked per member
+PAIRS_PER_REPO = 40         # bench bound on comparisons / repos
+
+_vec_cache = {}
+
+def _vector(shingle):
+    """K 32-bit hashes of one shingle (four salted blake2b digests)."""
+    v = _vec_cache.get(shingle)
+    if v is None:
+        b = shingle.encode("utf-8")
+        raw = b"".join(hashlib.blake2b(b, digest_size=64, salt=bytes([i]) * 16).digest() for i in range(K // 16))
+        v = array.array("I", raw)
+        if len(_vec_cache) < 2_000_000:
+            _vec_cache[shingle] = v
+    return v
+
+def minhash(shingles, min_count=1):
+    if len(shingles) < min_count:
+        return None
+    vecs = [_vector(s) for s in shingles]
+    if len(vecs) == 1:
+        return array.array("I", vecs[0])
+    return array.array("I", map(min, *vecs))
+
+def name_shingles(name):
+    n = re.sub(r"[^0-9a-z֐-׿]+", "", (name or "").lower())
+    if not n:
+        return set()
+    n = "^" + n + "$"
+    return {n[i:i + 2] for i in range(len(n) - 1)}
+
+def word_shingles(text, k=3):
+    words = re.findall(r"\w+", (text or "").lower())
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+def desc_shingles(text):
+    return word_shingles(text, 2)
+
+def readme_shingles(text):
+    return word_shingles(text, 3)
+
+def readme_signature(text):
+    return minhash(readme_shingles(text), MIN_SHINGLES["readme"])
+
+def encode(sig):
+    return base64.b64encode(sig.tobytes()).decode("ascii") if sig is not None else None
+
+def decode(s):
+    if not s:
+        return None
+    a = array.array("I")
+    a.frombytes(base64.b64decode(s))
+    return a
+
+def similarity(a, b):
+    return sum(map(operator.eq, a, b)) / K
+
+# a signature packed into one int: equal 32-bit lanes counted with a few big-int
+# ops (exact zero-lane test on a ^ b) instead of a Python loop over K values
+_LO = int.from_bytes(b"\xff\xff\xff\x7f" * K, "little")
+_HI = int.from_bytes(b"\x00\x00\x00\x80" * K, "little")
+
+def _packed_similarity(a, b):
+    x = a ^ b
+    return (~(((x & _LO) + _LO) | x | _LO) & _HI).bit_count() / K
+
+def signatures(repos, store=None):
+    """repos: [{"name", "description", "readme_minhash"?}] -> {name: {field: sig}}.
+
+    store (persisted dict) lets unchanged inputs skip re-hashing across runs.
+    """
+    out = {}
+    for r in repos:
+        name = r["name"]
+        key = hashlib.sha1(json.dumps([name, r.get("description") or ""], ensure_ascii=False).encode("utf-8")).hexdigest()
+        cached = (store or {}).get(name)
+        if cached and cached.get("h") == key:
+            sigs = {"name": decode(cached.get("name")), "desc": decode(cached.get("desc"))}
+        else:
+            sigs = {"name": minhash(name_shingles(name), MIN_SHINGLES["name"]),
+                    "desc": minhash(desc_shingles(r.get("description")), MIN_SHINGLES["desc"])}
+            if store is not None:
+                store[name] = {"h": key, "name": encode(sigs["name"]), "desc": encode(sigs["desc"])}
+        sigs["readme"] = r["readme_minhash"] if isinstance(r.get("readme_minhash"), array.array) else decode(r.get("readme_minhash"))
+        out[name] = sigs
+    return out
+
+def clusters(sigs, thresholds=THRESHOLDS):
+    """Near-duplicate clusters (lists of names, size > 1) from per-field signatures."""
+    names = list(sigs)
+    parent = list(range(len(names)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    stats = {"buckets": 0, "large_buckets": 0, "comparisons": 0, "merges": 0}
+    for field, t in thresholds.items():
+        buckets = {}
+        vals = {}
+        for idx, n in enumerate(names):
+            sig = sigs[n].get(field)
+            if sig is None:
+                continue
+            raw = sig.tobytes()
+            vals[idx] = int.from_bytes(raw, "little")
+            w = ROWS * sig.itemsize
+            for b in range(BANDS):
+                buckets.setdefault((b, raw[b * w:(b + 1) * w]), []).append(idx)
+        seen = set()
+
+        def check(a, m):
+            if find(m) == find(a) or (a, m) in seen:
+                return False
+            seen.add((a, m))
+            stats["comparisons"] += 1
+            if _packed_similarity(vals[a], vals[m]) >= t:
+                parent[find(m)] = find(a)
+                stats["merges"] += 1
+                return True
+            return False
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            stats["buckets"] += 1
+            if len(members) <= SMALL_BUCKET:
+                # every pair: similarity is not transitive, so a member can miss the
+                # first one and still match another
+                for x, a in enumerate(members):
+                    for m in members[x + 1:]:
+                        check(a, m)
+                continue
+            stats["large_buckets"] += 1
+            reps = []
+            for m in members:
+                roots, matched = set(), False
+                for a in reversed(reps):
+                    r = find(a)
+                    if r in roots:
+                        continue
+                    roots.add(r)
+                    matched = check(a, m) or matched or find(a) == find(m)
+                    if len(roots) >= MAX_REPS:
+                        break
+                if not matched:
+                    reps.append(m)
+
+    groups = {}
+    for i, n in enumerate(names):
+        groups.setdefault(find(i), []).append(n)
+    return sorted((sorted(g, key=str.lower) for g in groups.values() if len(g) > 1), key=lambda g: g[0].lower()), stats
+
+def load_store(path=SIG_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+def save_store(store, path=SIG_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(store, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def synthetic(n, seed=7):
+    """n repos with ~10% planted near-duplicates (case changes, dropped letters, suffixes)."""
+    rnd = random.Random(seed)
+    syll = ["ka", "mo", "ri", "ta", "zu", "ne", "lo", "pi", "sha", "dor", "gal", "hen", "yam", "tal"]
+    topics = ["math", "worksheet", "pdf", "system", "journal", "student", "parabola", "core", "sync", "hub"]
+    repos = []
+    for i in range(n):
+        if repos and rnd.random() < 0.1:
+            base = rnd.choice(repos[-200:])
+            nm = base["name"]
+            op = rnd.randrange(3)
+            if op == 0:
+                nm = nm.upper()
+            elif op == 1 and len(nm) > 5:
+                j = rnd.randrange(1, len(nm) - 1)
+                nm = nm[:j] + nm[j + 1:]
+            else:
+                nm = nm + "-2"
+            repos.append({"name": f"{nm}-{i}" if any(r["name"] == nm for r in repos[-200:]) else nm,
+                          "description": base["description"]})
+            continue
+        nm = "".join(rnd.choice(syll) for _ in range(rnd.randint(3, 5))) + f"{i:x}"
+        desc = " ".join(rnd.choice(topics) for _ in range(rnd.randint(0, 6)))
+        if desc:
+            desc += f" {nm} {i}"
+        repos.append({"name": nm, "description": desc})
+    return repos
+
+def bench(sizes):
+    results = []
+    for n in sizes:
+        _vec_cache.clear()
+        repos = synthetic(n)
+        t0 = time.perf_counter()
+        sigs = signatures(repos)
+        t1 = time.perf_counter()
+        groups, stats = clusters(sigs)
+        t2 = time.perf_counter()
+        # templated names (repo-00001, ...) share one huge bucket per band
+        _, tstats = clusters(signatures([{"name": f"repo-{i:07d}", "description": ""} for i in range(n)]))
+        for what, st in (("synthetic", stats), ("templated", tstats)):
+            assert st["comparisons"] <= PAIRS_PER_REPO * n, f"{what}: {st['comparisons']} comparisons for {n} repos"
+        results.append({
+            "repos": n,
+            "signature_s": round(t1 - t0, 3),
+            "lsh_s": round(t2 - t1, 3),
+            "clusters": len(groups),
+            "comparisons": stats["comparisons"],
+            "templated_comparisons": tstats["comparisons"],
+            "all_pairs": n * (n - 1) // 2,
+        })
+    return results
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        sizes = [int(x) for x in args[1:]] or [10000, 100000]
+        for r in bench(sizes):
+            print(json.dumps(r))
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
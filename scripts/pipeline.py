@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""Single-pass governance pipeline: one enumeration feeding a DAG of stages.
+
+governance_v4_auto.py (tag, risk_score), build_v4.py (risk, critical, category,
+duplicates) and the age-based lifecycle tags each classified the same inventory
+on their own. Here it is enumerated and parsed once: RepoRecord timestamps are
+parsed on load and every repo gets one age against one clock, which all stages read.
+
+  tags     tag, lifecycle (ACTIVE/CLEANUP/ARCHIVE by age), critical
+  score    governance risk_score (columnar, scoring.py)
+  readme   README blob SHA fingerprints (readme_fingerprint.py)
+  dedupe   duplicate names/descriptions/READMEs, near duplicates, risk, category
+  render   repo-intelligence.jsonl/.json and dashboard.md in --out
+
+A stage names the record fields it reads, the stages it runs after and the settings
+it depends on (weights, env options, the output dir). Its digest covers those fields
+over the whole inventory, those settings and the digests of the stages before it;
+when it matches the output saved under <root>/stages/, that output is reused and
+the stage is skipped. Ages move every day, so age-based stages digest the raw
+timestamps plus "age_band" (scoring.age_band) and re-run only when a repo crosses
+an age threshold; age_days itself is read from Pipeline.age, never from a saved
+output, and only render (which prints it) digests it. A stage that reported errors, or ran on top of one that did,
+is not saved, so the next run retries it. register() adds stages.
+
+governance_v4_auto.py (tags, score) and build_v4.py (tags, readme, dedupe) run
+their classification through these stages; this CLI runs all of them and renders
+one combined document. With --run it classifies the records a governance run
+already listed (<run>/inventory.jsonl, "latest" for the newest run) instead of
+enumerating again, one pipeline per swept owner under --out/<login> (the
+governance workflow's "Classify" step).
+
+  python scripts/pipeline.py [--run DIR|latest | --raw FILE] [--out STATE/pipeline/latest] [--stages a,b] [--force]
+"""
+import os, sys, json, time, hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import gh_client
+import jsonl_stream
+import near_dup
+import readme_fingerprint
+import run_index
+import scoring
+import tracing
+from repo_record import RepoRecord
+
+ROOT = Path("STATE/pipeline")
+OUT = ROOT / "latest"
+TOP_N = 25
+
+class Stage:
+    __slots__ = ("name", "run", "after", "reads", "config", "version")
+
+    def __init__(self, name, run, after=(), reads=(), config=None, version=1):
+        self.name, self.run, self.after, self.reads, self.version = name, run, tuple(after), tuple(reads), version
+        self.config = config
+
+STAGES = {}
+
+def register(name, run, after=(), reads=(), config=None, version=1):
+    """run(pipeline) -> (rows aligned with the records or None, summary dict).
+    config(pipeline) -> JSON-able settings the output depends on (part of the digest).
+    A summary "files" list must still exist for a saved output to be reused; a
+    non-empty summary "errors" (or "failed") keeps the output from being saved."""
+    STAGES[name] = Stage(name, run, after, reads, config, version)
+
+def plan(names=None):
+    """Stage names in dependency order, pulling in whatever the requested ones need."""
+    want, todo = set(), list(names or STAGES)
+    while todo:
+        n = todo.pop()
+        if n not in STAGES:
+            raise SystemExit(f"unknown stage: {n}")
+        if n not in want:
+            want.add(n)
+            todo += STAGES[n].after
+    out, done = [], set()
+    while len(out) < len(want):
+        ready = [n for n in STAGES if n in want and n not in done and all(a in done for a in STAGES[n].after)]
+        if not ready:
+            raise SystemExit(f"stage cycle among: {sorted(want - done)}")
+        out += ready
+        done.update(ready)
+    return out
+
+def _load_saved(p, digest):
+    try:
+        doc = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if doc.get("digest") != digest or not all(Path(f).exists() for f in doc["summary"].get("files", [])):
+        return None
+    return doc
+
+def _save(p, doc):
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(doc, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, p)
+
+class Pipeline:
+    """root=None runs every stage and saves nothing (callers with their own reuse).
+    relist=False keeps the readme stage from listing the owner again for OIDs."""
+
+    def __init__(self, owner, records, now=None, client=None, out=OUT, root=ROOT, relist=True):
+        self.owner, self.records, self.client, self.out = owner, records, client, Path(out)
+        self.relist = relist
+        self.root = Path(root) if root is not None else None
+        self.now = now or datetime.now(timezone.utc)
+        now_ts = self.now.timestamp()
+        # the one place timestamps become ages; every stage reads these
+        self.age = []
+        for r in records:
+            ts = getattr(r, "updated_ts", 0.0) or getattr(r, "pushed_ts", 0.0)
+            self.age.append(999999 if not ts else int((now_ts - ts) // 86400))
+        self.results = {}
+        self.status = []
+
+    def rows(self, name):
+        return self.results[name]["rows"]
+
+    def summary(self, name):
+        return self.results[name]["summary"]
+
+    def _digests(self, names):
+        """Per-stage input digests from one walk over the records."""
+        fields = {n: ("name",) + STAGES[n].reads for n in names}
+        hs = {n: hashlib.sha256() for n in names}
+        for r, age in zip(self.records, self.age):
+            derived = {"age_days": age, "age_band": scoring.age_band(age)}
+            for n in names:
+                hs[n].update(repr(tuple(derived[f] if f in derived else r.get(f) for f in fields[n])).encode("utf-8"))
+        out = {}
+        for n in names:
+            st = STAGES[n]
+            h = hs[n]
+            cfg = st.config(self) if st.config else None
+            h.update(json.dumps([st.version, cfg, [out[a] for a in st.after]], sort_keys=True, default=str).encode("utf-8"))
+            out[n] = h.hexdigest()
+        return out
+
+    def execute(self, names=None, force=False):
+        order = plan(names)
+        if self.root is None:
+            digests = dict.fromkeys(order)  # nothing is saved or reused, so nothing to key
+        else:
+            with tracing.span("digest"):
+                digests = self._digests(order)
+        unsaved = set()
+        for n in order:
+            t0 = time.perf_counter()
+            saved = self.root / "stages" / f"{n}.json" if self.root is not None else None
+            with tracing.span(n):
+                doc = None if force or saved is None else _load_saved(saved, digests[n])
+                if doc is None:
+                    rows, summary = STAGES[n].run(self)
+                    doc = {"digest": digests[n], "rows": rows, "summary": summary}
+                    ran = True
+                    if saved is not None:
+                        if summary.get("errors") or summary.get("failed") or unsaved.intersection(STAGES[n].after):
+                            # retried next run; an older save must not vouch for this output
+                            unsaved.add(n)
+                            saved.unlink(missing_ok=True)
+                        else:
+                            _save(saved, doc)
+                else:
+                    ran = False
+            self.results[n] = doc
+            self.status.append({"stage": n, "ran": ran, "saved": saved is not None and n not in unsaved,
+                                "s": round(time.perf_counter() - t0, 4)})
+        return self.status
+
+# stages
+
+def stage_tags(p):
+    rows, counts = [], {}
+    for r, age in zip(p.records, p.age):
+        life = scoring.lifecycle(age)
+        counts[life] = counts.get(life, 0) + 1
+        rows.append({"tag": r.tag, "lifecycle": life, "critical": scoring.critical(r.name, age)})
+    return rows, {"lifecycle": counts}
+
+def stage_score(p):
+    recs = p.records
+    if all("archived" in r and "open_issues" in r and "size_kb" in r for r in recs):
+        cols = scoring.columns(recs)  # typed fields straight off the records
+    else:
+        cols = scoring.columns([{"archived": r.get("archived"), "tag": t["tag"], "open_issues": r.get("open_issues"),
+                                 "size_kb": r.get("size_kb"), "private": r.get("private")}
+                                for r, t in zip(recs, p.rows("tags"))])
+    scores = scoring.score_columns(cols)
+    # unrounded, so callers rank exactly as before; rounded when written out
+    return [{"risk_score": s} for s in scores], {"top": [p.records[i].name for i in scoring.top_n(scores, TOP_N)]}
+
+def stage_readme(p):
+    if p.client is None:
+        return [None] * len(p.records), {"stats": {}, "errors": [r.name for r in p.records], "failed": "no client"}
+    cache = readme_fingerprint.load_cache()
+    # a GraphQL enumeration already carries the README OIDs; no second listing
+    inv = p.records if p.records and all("readme_oid" in r for r in p.records) else None
+    try:
+        fps, stats = readme_fingerprint.fingerprint(
+            p.client, p.owner, [(r.name, r.get("updated_at") or r.get("pushed_at") or "") for r in p.records], cache,
+            with_sha256=os.environ.get("README_SHA256") == "1", inventory=inv, relist=p.relist)
+        readme_fingerprint.save_cache(cache)
+        failed = None
+    except Exception as ex:
+        # dedupe still runs on names and descriptions; the stage is retried next run
+        fps, stats, failed = {}, {}, f"{type(ex).__name__}: {ex}"
+    rows = []
+    for r in p.records:
+        fp = fps.get(r.name)
+        rows.append({"readme_blob_sha": fp["oid"], "readme_sha256": fp["sha256"], "readme_minhash": fp["minhash"]}
+                    if fp else None)
+    summary = {"stats": stats, "errors": [r.name for r, x in zip(p.records, rows) if x is None]}
+    if failed:
+        summary["failed"] = failed
+    return rows, summary
+
+def _groups(pairs):
+    m = {}
+    for key, name in pairs:
+        if key:
+            m.setdefault(key, []).append(name)
+    return [v for v in m.values() if len(v) > 1]
+
+def stage_dedupe(p):
+    recs, fps = p.records, p.rows("readme")
+    descs = [(r.get("description") or "").replace("\n", " ").strip() for r in recs]
+    dup_names = _groups((r.name.lower(), r.name) for r in recs)
+    dup_desc = _groups((hashlib.md5(d.encode("utf-8", "ignore")).hexdigest() if d else None, r.name) for r, d in zip(recs, descs))
+    dup_readme = _groups(((fp or {}).get("readme_sha256"), r.name) for r, fp in zip(recs, fps))
+    dup_blob = _groups(((fp or {}).get("readme_blob_sha"), r.name) for r, fp in zip(recs, fps))
+    store = near_dup.load_store()
+    sigs = near_dup.signatures([{"name": r.name, "description": d, "readme_minhash": (fp or {}).get("readme_minhash")}
+                                for r, d, fp in zip(recs, descs, fps)], store)
+    near, nd_stats = near_dup.clusters(sigs)
+    near_dup.save_store({n: store[n] for n in sigs if n in store})
+
+    name_set = {x for g in dup_names for x in g}
+    desc_set = {x for g in dup_desc for x in g}
+    near_set = {x for g in near for x in g}
+    rows = []
+    for r, age, d in zip(recs, p.age, descs):
+        n = r.name
+        # a source without descriptions (REST listing) is not penalised for lacking one
+        has_desc = bool(d) if r.get("description") is not None else True
+        risk = scoring.build_risk(r.get("private"), age, has_desc, n in name_set, n in desc_set,
+                                  n in near_set and n not in name_set and n not in desc_set)
+        rows.append({"risk": risk, "category": scoring.category(risk), "description": d[:180]})
+    return rows, {"duplicate_names": dup_names, "duplicate_descriptions": dup_desc,
+                  "duplicate_readme_sha256": dup_readme, "duplicate_readme_blob_sha": dup_blob,
+                  "near_duplicates": near, "near_duplicate_stats": nd_stats}
+
+def _item(r, *parts):
+    item = {"name": r.name, "private": r.get("private"), "archived": r.get("archived"),
+            "open_issues": r.get("open_issues"), "size_kb": r.get("size_kb"), "url": r.get("html_url"),
+            "pushed_at": r.get("pushed_at"), "updatedAt": r.get("updated_at")}
+    for part in parts:
+        if part:
+            item.update(part)
+    item.pop("readme_minhash", None)
+    if "risk_score" in item:
+        item["risk_score"] = round(item["risk_score"], 4)
+    return item
+
+def stage_render(p):
+    p.out.mkdir(parents=True, exist_ok=True)
+    cols = [p.rows(n) for n in ("tags", "score", "dedupe", "readme")] + [[{"age_days": a} for a in p.age]]
+    order = sorted(range(len(p.records)), key=lambda i: (-cols[2][i]["risk"], -p.age[i], p.records[i].name.lower()))
+    dd = p.summary("dedupe")
+    out_jsonl = p.out / "repo-intelligence.jsonl"
+    counts = {"category": {}, "critical": {}}
+    with jsonl_stream.JsonlWriter(out_jsonl, {"generated": p.now.isoformat(), "owner": p.owner,
+                                              "total": len(p.records)}) as w:
+        for i in order:
+            item = _item(p.records[i], *(c[i] for c in cols))
+            for k in counts:
+                counts[k][item[k]] = counts[k].get(item[k], 0) + 1
+            w.write(item)
+        by_name = {p.records[i].name: i for i in range(len(p.records))}
+        highest = [_item(p.records[by_name[n]], *(c[by_name[n]] for c in cols)) for n in p.summary("score")["top"]]
+        w.close(dict(dd, highest_risk=highest, lifecycle=p.summary("tags")["lifecycle"],
+                     readme_fingerprint=p.summary("readme")["stats"], errors=p.summary("readme")["errors"]))
+    out_json = p.out / "repo-intelligence.json"
+    jsonl_stream.write_pretty_view(out_jsonl, out_json)
+
+    dash = ["# GOVERNANCE PIPELINE", "", f"Owner: {p.owner}", f"Total repos: {len(p.records)}", ""]
+    for title, key, names in (("Lifecycle", None, ["ACTIVE", "CLEANUP", "ARCHIVE"]),
+                              ("Category counts", "category", ["SAFE", "REVIEW", "DUPLICATE_RISK", "ARCHIVE_STRONG"]),
+                              ("Critical counts", "critical", ["HIGH", "MEDIUM", "LOW"])):
+        c = counts[key] if key else p.summary("tags")["lifecycle"]
+        dash += [f"## {title}"] + [f"- {k}: {c.get(k, 0)}" for k in names] + [""]
+    dash.append(f"## Highest risk (top {TOP_N})")
+    for i in order[:TOP_N]:
+        e = _item(p.records[i], *(c[i] for c in cols))
+        vis = "private" if e["private"] else "public"
+        dash.append(f"- {e['name']} | risk={e['risk']} | {e['category']} | {e['lifecycle']} | age={e['age_days']}d | {vis} | {e['url']}")
+    dash.append("")
+    for title, key in (("Duplicate Names", "duplicate_names"), ("Duplicate README (git blob sha)", "duplicate_readme_blob_sha"),
+                       ("Near duplicates (MinHash/LSH)", "near_duplicates")):
+        dash += [f"## {title}"] + (["- " + ", ".join(g) for g in dd[key]] or ["- none"]) + [""]
+    dash += ["## Stages"] + [f"- {s['stage']}: {'ran' if s['ran'] else 'skipped (inputs unchanged)'} {s['s']}s"
+                             for s in p.status] + [""]
+    dash += tracing.dashboard_lines()
+    out_md = p.out / "dashboard.md"
+    out_md.write_text("\n".join(dash) + "\n", encoding="utf-8")
+    return None, {"files": [str(out_jsonl), str(out_json), str(out_md)]}
+
+def _readme_config(p):
+    return {"owner": p.owner, "token": bool(p.client and p.client.token),
+            "sha256": os.environ.get("README_SHA256") == "1",
+            "inventory": bool(p.records) and all("readme_oid" in r for r in p.records), "relist": p.relist}
+
+register("tags", stage_tags, reads=("pushed_at", "updated_at", "age_band"),
+         config=lambda p: {"lifecycle": scoring.LIFECYCLE, "age_cuts": scoring.AGE_CUTS}, version=2)
+register("score", stage_score, after=("tags",), reads=("archived", "pushed_at", "open_issues", "size_kb", "private"),
+         config=lambda p: {"weights": scoring.GOVERNANCE, "top": TOP_N})
+register("readme", stage_readme, reads=("updated_at", "pushed_at", "readme_oid"), config=_readme_config)
+register("dedupe", stage_dedupe, after=("tags", "readme"), reads=("description", "private", "age_band"),
+         config=lambda p: {"weights": scoring.BUILD, "categories": scoring.CATEGORIES, "near_dup": near_dup.THRESHOLDS},
+         version=3)
+register("render", stage_render, after=("tags", "score", "dedupe", "readme"), reads=("age_days",),
+         config=lambda p: {"out": str(p.out.resolve()), "top": TOP_N})
+
+# enumeration
+
+def load_raw(path):
+    """RepoRecords from a saved inventory: `gh repo list --json`, list_repos() or REST items."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    out = []
+    for d in data:
+        if "isPrivate" in d or "updatedAt" in d:
+            r = RepoRecord.from_gh_json(d)
+        elif "open_issues_count" in d:
+            r = RepoRecord.from_rest(d)
+        else:
+            r = RepoRecord.from_dict(d)
+        if r.name:
+            out.append(r)
+    return out
+
+def load_run(run_dir):
+    """[(login, records)] from a governance run's inventory.jsonl; a sweep's "login/repo"
+    names are split back per owner."""
+    path = Path(run_dir) / "inventory.jsonl"
+    if not path.is_file():
+        raise SystemExit(f"{path} not found (runs before inventory.jsonl cannot be classified)")
+    owners = jsonl_stream.read_header(path).get("owners") or []
+    if len(owners) == 1:
+        return [(owners[0], [r for r in map(RepoRecord.from_dict, jsonl_stream.iter_records(path)) if r.name])]
+    per = {login: [] for login in owners}
+    for d in jsonl_stream.iter_records(path):
+        login, _, name = d["name"].partition("/")
+        if login in per and name:
+            per[login].append(RepoRecord.from_dict(dict(d, name=name)))
+    return list(per.items())
+
+def enumerate_repos(owner, client):
+    """GraphQL inventory with a token (descriptions, updatedAt, README OIDs in one query), else REST."""
+    if client.token:
+        from graphql_inventory import list_repos_graphql
+        return list_repos_graphql(owner, client)[0]
+    from governance_v4_auto import list_repos
+    return list_repos(owner, client.token)[0]
+
+def _opt(args, flag, default):
+    if flag in args:
+        i = args.index(flag)
+        v = args[i + 1]
+        del args[i:i + 2]
+        return v
+    return default
+
+def main():
+    args = sys.argv[1:]
+    run = _opt(args, "--run", None)
+    raw = _opt(args, "--raw", None)
+    out = Path(_opt(args, "--out", OUT))
+    names = _opt(args, "--stages", None)
+    force = "--force" in args
+    tracing.from_env()
+    client = gh_client.GitHubClient(token=gh_client.resolve_token())
+    owner = os.environ.get("OWNER") or os.environ.get("GITHUB_REPOSITORY_OWNER") or ""
+    if run == "latest":
+        run = run_index.latest()
+        if run is None:
+            raise SystemExit("no governance run found")
+    if not run and not raw and not owner:
+        raise SystemExit("missing OWNER/GITHUB_REPOSITORY_OWNER (or --run DIR / --raw FILE)")
+    with tracing.span("enumerate"):
+        if run:
+            groups = load_run(run)
+        else:
+            groups = [(owner, load_raw(raw) if raw else enumerate_repos(owner, client))]
+    report = []
+    for login, records in groups:
+        sweep = len(groups) > 1
+        p = Pipeline(login, records, client=client, out=out / login if sweep else out,
+                     root=ROOT / "owners" / login if sweep else ROOT, relist=not run)
+        status = p.execute(names.split(",") if names else None, force)
+        report.append({"owner": login, "repos": len(records), "stages": status})
+    if tracing.enabled():
+        out.mkdir(parents=True, exist_ok=True)
+        tracing.write(out / "timings.json")
+    print(json.dumps(report[0] if len(report) == 1 else report))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Publish the latest governance run as a sharded static feed for GitHub Pages.
+
+  docs/data/feed/manifest.json                         small, fetched first
+  docs/data/feed/shards/<owner>/<category>.<page>.<hash>.json[.gz]
+
+Records are grouped per owner and category (ARCHIVED, or the governance tag),
+sorted by risk and cut into FEED_PAGE_SIZE pages. Shard names carry a content
+hash, so an unchanged page keeps its URL (and its browser/CDN cache) across runs
+and is not rewritten. Shards referenced by neither the new nor the previous
+manifest are removed. Each shard also gets a byte-stable .gz, which index.html fetches.
+
+  python scripts/publish_feed.py [RUN_DIR] [--out docs/data/feed]
+"""
+import os, sys, gzip, json, hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import run_index
+import jsonl_stream
+import snapshot_store
+
+OUT = Path("docs/data/feed")
+MANIFEST = "manifest.json"
+PAGE_SIZE = int(os.environ.get("FEED_PAGE_SIZE") or 500)
+SUMMARY_TOP = 25
+
+def category(rec):
+    if rec.get("category"):
+        return rec["category"]
+    if rec.get("archived"):
+        return "ARCHIVED"
+    return rec.get("tag") or "UNKNOWN"
+
+def _slug(s):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in s) or "_"
+
+def load_records(run_dir):
+    """(owner, records) of a run; JSONL stream when present, else the (maybe compacted) JSON."""
+    run_dir = Path(run_dir)
+    jl = run_dir / "repo-intelligence-v4.jsonl"
+    if jl.is_file():
+        return jsonl_stream.read_header(jl).get("owner") or "", list(jsonl_stream.iter_records(jl))
+    doc = snapshot_store.load_json(run_dir)
+    return doc.get("owner") or "", doc.get("repos") or []
+
+def group(owner, records):
+    """{owner: {category: [records]}}; sweep runs name repos "owner/repo"."""
+    out = {}
+    for r in records:
+        o, _, name = r["name"].rpartition("/")
+        if not o:
+            o, name = owner, r["name"]
+        out.setdefault(o, {}).setdefault(category(r), []).append(dict(r, name=name))
+    for cats in out.values():
+        for recs in cats.values():
+            recs.sort(key=lambda x: (-(x.get("risk_score") or x.get("risk") or 0), x["name"].lower()))
+    return out
+
+def _write_variants(path, data):
+    sizes = {"bytes": len(data)}
+    if not path.exists():
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    gz = path.with_name(path.name + ".gz")
+    if not gz.exists():
+        # mtime=0 keeps the .gz byte-stable for an unchanged shard
+        gz.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    sizes["gz_bytes"] = gz.stat().st_size
+    return sizes
+
+def _shard_files(manifest):
+    for o in (manifest or {}).get("owners", {}).values():
+        for c in o["categories"].values():
+            for s in c["shards"]:
+                yield s["file"]
+
+def publish(run_dir=None, out=OUT, page_size=PAGE_SIZE):
+    run_dir = Path(run_dir) if run_dir else run_index.latest()
+    if run_dir is None:
+        raise SystemExit("no governance run found")
+    out = Path(out)
+    owner, records = load_records(run_dir)
+    try:
+        prev = json.loads((out / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        prev = None
+
+    manifest = {
+        "generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "run": run_dir.name,
+        "total": len(records),
+        "page_size": page_size,
+        "encodings": ["gzip"],
+        "owners": {},
+        "highest_risk": [],
+    }
+    groups = group(owner, records)
+    written = reused = 0
+    for o, cats in sorted(groups.items()):
+        entry = manifest["owners"][o] = {"total": 0, "categories": {}}
+        for cat, recs in sorted(cats.items()):
+            shards = []
+            for page, lo in enumerate(range(0, len(recs), page_size)):
+                chunk = recs[lo:lo + page_size]
+                data = json.dumps({"owner": o, "category": cat, "page": page, "repos": chunk},
+                                  ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                h = hashlib.sha256(data).hexdigest()
+                rel = f"shards/{_slug(o)}/{_slug(cat)}.{page}.{h[:12]}.json"
+                p = out / rel
+                p.parent.mkdir(parents=True, exist_ok=True)
+                if p.exists():
+                    reused += 1
+                else:
+                    written += 1
+                shards.append(dict({"file": rel, "count": len(chunk), "sha256": h}, **_write_variants(p, data)))
+            entry["categories"][cat] = {"count": len(recs), "shards": shards}
+            entry["total"] += len(recs)
+
+    # first paint: the top of the whole run, without any shard fetch
+    top = sorted(((o, r) for o, cats in groups.items() for recs in cats.values() for r in recs[:SUMMARY_TOP]),
+                 key=lambda x: (-(x[1].get("risk_score") or x[1].get("risk") or 0), x[0], x[1]["name"].lower()))
+    manifest["highest_risk"] = [dict(r, owner=o) for o, r in top[:SUMMARY_TOP]]
+
+    out.mkdir(parents=True, exist_ok=True)
+    tmp = out / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, out / MANIFEST)
+
+    # keep the previous generation so a page that loaded the old manifest still resolves
+    keep = set(_shard_files(manifest)) | set(_shard_files(prev))
+    removed = 0
+    shard_root = out / "shards"
+    for p in shard_root.rglob("*") if shard_root.is_dir() else []:
+        if not p.is_file():
+            continue
+        rel = p.relative_to(out).as_posix()
+        if rel.endswith(".gz"):
+            rel = rel[:-3]
+        if rel not in keep:
+            p.unlink()
+            removed += 1
+    return {"run": run_dir.name, "total": len(records), "owners": len(manifest["owners"]),
+            "shards": sum(1 for _ in _shard_files(manifest)), "written": written, "reused": reused,
+            "removed_files": removed, "manifest_bytes": (out / MANIFEST).stat().st_size}
+
+def main():
+    args = sys.argv[1:]
+    out = OUT
+    if "--out" in args:
+        i = args.index("--out")
+        out = Path(args[i + 1])
+        del args[i:i + 2]
+    print(json.dumps(publish(args[0] if args else None, out)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import os, time, heapq, threading
+
+ENUMERATE, README, ENRICH = 0, 1, 2
+PRIORITY_NAMES = {ENUMERATE: "enumerate", README: "readme", ENRICH: "enrich"}
+
+def parse_int(v):
+    """Integer header value, or None when missing or not an integer (e.g. an HTTP-date Retry-After)."""
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+class RateScheduler:
+    """Token-bucket request scheduler driven by GitHub's X-RateLimit-* headers.
+
+    Requests go out in priority order (ENUMERATE, then README, then ENRICH). The bucket
+    refills at max_rps until the remaining budget drops below low_water; from there the
+    budget left is spread evenly over the time until X-RateLimit-Reset. Each class keeps
+    a reserve: lower classes stop first as the budget runs out, and wait for the reset
+    instead of starving enumeration. Rate-limit responses (403/429 with Retry-After or
+    remaining=0) pause every class until the limit resets.
+    """
+
+    def __init__(self, max_rps=15.0, low_water=500, reserves=None):
+        self.max_rps = max_rps
+        self.low_water = low_water
+        self.reserves = reserves or {ENUMERATE: 0, README: 50, ENRICH: 200}
+        self.tokens = max_rps
+        self.last = time.monotonic()
+        self.remaining = None
+        self.limit = None
+        self.reset = None
+        self.paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = 0
+        self.metrics = {"requests": 0, "throttled_s": 0.0, "pauses": 0, "by_priority": {}}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_rps=float(os.environ.get("RATE_MAX_RPS") or "15"),
+            low_water=int(os.environ.get("RATE_LOW_WATER") or "500"),
+        )
+
+    def _refill(self, now):
+        rate = self.max_rps
+        wall = time.time()
+        if self.reset is not None and wall >= self.reset:
+            self.remaining = None  # window rolled over; wait for fresh headers
+        if self.remaining is not None and self.reset is not None and self.remaining < self.low_water:
+            window = max(self.reset - wall, 1.0)
+            rate = min(self.max_rps, max(self.remaining, 0) / window)
+        self.tokens = min(self.max_rps, self.tokens + (now - self.last) * rate)
+        self.last = now
+        return rate
+
+    def _delay(self, priority):
+        wall = time.time()
+        if self.paused_until > wall:
+            return self.paused_until - wall
+        rate = self._refill(time.monotonic())
+        if self.remaining is not None and self.reset is not None:
+            if self.remaining - self.reserves.get(priority, 0) <= 0:
+                return max(self.reset - wall, 1.0)
+        if self.tokens >= 1:
+            return 0.0
+        if rate <= 0:
+            return max((self.reset or wall + 60) - wall, 1.0)
+        return (1 - self.tokens) / rate
+
+    def acquire(self, priority=ENUMERATE):
+        with self._cond:
+            self._seq += 1
+            ticket = (priority, self._seq)
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                if self._waiting[0] == ticket:
+                    wait = self._delay(priority)
+                    if wait <= 0:
+                        break
+                    t0 = time.monotonic()
+                    self._cond.wait(wait)
+                    self.metrics["throttled_s"] += time.monotonic() - t0
+                else:
+                    self._cond.wait(1.0)
+            heapq.heappop(self._waiting)
+            self.tokens -= 1
+            if self.remaining is not None:
+                self.remaining -= 1
+            self.metrics["requests"] += 1
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            self.metrics["by_priority"][name] = self.metrics["by_priority"].get(name, 0) + 1
+            self._cond.notify_all()
+
+    def observe(self, status, headers):
+        """Update the budget from a response. Returns seconds to wait before retrying
+        a throttled request, or 0 if the response was not a rate-limit rejection."""
+        remaining = parse_int(headers.get("X-RateLimit-Remaining"))
+        limit = parse_int(headers.get("X-RateLimit-Limit"))
+        reset = parse_int(headers.get("X-RateLimit-Reset"))
+        retry_after = parse_int(headers.get("Retry-After"))
+        with self._cond:
+            if remaining is not None:
+                self.remaining = remaining
+            if limit is not None:
+                self.limit = limit
+            if reset is not None:
+                self.reset = reset
+            if status not in (403, 429):
+                return 0
+            now = time.time()
+            if retry_after is not None:
+                wait = retry_after
+            elif remaining == 0 and reset is not None:
+                wait = max(reset - now, 0) + 1
+            elif status == 429:
+                wait = 60
+            else:
+                return 0  # plain 403: permissions, not throttling
+            self.paused_until = max(self.paused_until, now + wait)
+            self.metrics["pauses"] += 1
+            self._cond.notify_all()
+            return wait
+
+    def snapshot(self):
+        with self._cond:
+            m = dict(self.metrics)
+            m["throttled_s"] = round(m["throttled_s"], 3)
+            m["by_priority"] = dict(m["by_priority"])
+            m["budget_remaining"] = self.remaining
+            m["budget_limit"] = self.limit
+            m["budget_reset"] = self.reset
+            return m
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""README fingerprints from git blob SHAs, for every repo.
+
+The blob SHA is already a content hash, so duplicate READMEs share it and nothing
+has to be downloaded. With a token, OIDs come from the batched GraphQL inventory
+(50-100 repos per request). Without one, REST /readme is used only for repos whose
+updatedAt changed since the cached entry, and it stops at the README budget reserve.
+Fingerprints are cached in STATE/readme-fingerprints.json, per repo and, for the
+optional content sha256 and MinHash signature (near_dup.py), per blob SHA.
+"""
+import os, json, hashlib
+from pathlib import Path
+
+import rate_limit
+import near_dup
+from graphql_inventory import list_repos_graphql, fetch_readmes
+
+CACHE_PATH = Path("STATE/readme-fingerprints.json")
+
+def load_cache(path=CACHE_PATH):
+    try:
+        c = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        c = {}
+    c.setdefault("by_repo", {})
+    c.setdefault("by_oid", {})
+    return c
+
+def save_cache(cache, path=CACHE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(cache, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _budget_left(client):
+    sch = client.scheduler
+    if sch.remaining is None:
+        return True
+    return sch.remaining > sch.reserves.get(rate_limit.README, 0)
+
+def fingerprint(client, owner, repos, cache=None, with_sha256=False, inventory=None, relist=True):
+    """repos: [(name, updatedAt)]. Returns ({name: {"oid", "sha256", "minhash"}}, stats).
+
+    inventory: GraphQL records already fetched by the caller (they carry readme_oid),
+    used instead of listing the owner again. relist=False never lists the owner, even
+    with a token: repos without an inventory go through the cached REST /readme path.
+
+    with_sha256 downloads README text once per blob SHA never seen before
+    (batched GraphQL) to fill in sha256 and the MinHash signature; known SHAs
+    always come from the cache.
+    """
+    cache = cache if cache is not None else load_cache()
+    by_repo, by_oid = cache["by_repo"], cache["by_oid"]
+    stats = {"graphql_requests": 0, "rest_requests": 0, "cached": 0, "missing": 0}
+    wanted = {name for name, _ in repos}
+
+    if inventory is not None or (client.token and relist):
+        if inventory is None:
+            inventory, meta = list_repos_graphql(owner, client)
+            stats["graphql_requests"] += meta["requests"]
+        for r in inventory:
+            if r["name"] in wanted:
+                by_repo[r["name"]] = {"oid": r["readme_oid"], "updatedAt": r.get("updated_at") or ""}
+    else:
+        for name, updated in repos:
+            old = by_repo.get(name)
+            if old and old.get("updatedAt") == updated:
+                stats["cached"] += 1
+                continue
+            if not _budget_left(client):
+                continue
+            st, _, body = client.get(f"repos/{owner}/{name}/readme", priority=rate_limit.README)
+            stats["rest_requests"] += 1
+            if st == 200:
+                try:
+                    oid = json.loads(body).get("sha")
+                except Exception:
+                    oid = None
+                by_repo[name] = {"oid": oid, "updatedAt": updated}
+            elif st == 404:
+                by_repo[name] = {"oid": None, "updatedAt": updated}
+
+    if with_sha256 and client.token:
+        need = [n for n in wanted if (by_repo.get(n) or {}).get("oid") and "minhash" not in by_oid.get(by_repo[n]["oid"], {})]
+        # one download per distinct blob, whichever repo carries it
+        per_oid = {}
+        for n in need:
+            per_oid.setdefault(by_repo[n]["oid"], n)
+        if per_oid:
+            texts = fetch_readmes(client, owner, sorted(per_oid.values()))
+            stats["graphql_requests"] += -(-len(per_oid) // 50)
+            for oid, n in per_oid.items():
+                if texts.get(n) is not None:
+                    ent = by_oid.setdefault(oid, {})
+                    ent["sha256"] = hashlib.sha256(texts[n].encode("utf-8")).hexdigest()
+                    ent["minhash"] = near_dup.encode(near_dup.readme_signature(texts[n]))
+
+    out = {}
+    for name, _ in repos:
+        entry = by_repo.get(name)
+        if entry is None:
+            stats["missing"] += 1
+            continue
+        oid = entry.get("oid")
+        known = (by_oid.get(oid) or {}) if oid else {}
+        out[name] = {"oid": oid, "sha256": known.get("sha256"), "minhash": known.get("minhash")}
+    return out, stats
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""RepoRecord: one slots-based record per repo, shared by the governance scripts.
+
+Fields are parsed once (bools, ints, UTC timestamps) and stored in __slots__, so
+there is no per-repo dict. A field that the source did not provide stays unset and
+is left out of to_dict(), so each JSON shape round-trips losslessly:
+list_repos() / GraphQL records (to_dict), `gh repo list --json` records
+(to_gh_json) and governance items (to_item). Mapping-style access (r["name"],
+r.get(...)) keeps older callers working.
+
+  python scripts/repo_record.py --bench 100000
+"""
+import sys, json, time, random, tracemalloc
+from datetime import datetime
+
+# dict order of list_repos() (REST) and node_to_repo() (GraphQL adds the last five)
+FIELDS = ("name", "private", "archived", "open_issues", "size_kb", "pushed_at", "default_branch", "html_url",
+          "description", "updated_at", "rules_md", "readme_md", "readme_oid")
+
+def parse_ts(s):
+    """ISO-8601 (Z or offset) -> epoch seconds; 0.0 when empty or unparseable."""
+    if not s:
+        return 0.0
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+class RepoRecord:
+    __slots__ = FIELDS + ("pushed_ts", "updated_ts")
+
+    def __init__(self, **kw):
+        for k, v in kw.items():
+            setattr(self, k, v)
+        # parsed once; left unset (no float object) when the source has no such field
+        if "pushed_at" in kw:
+            self.pushed_ts = parse_ts(kw["pushed_at"])
+        if "updated_at" in kw:
+            self.updated_ts = parse_ts(kw["updated_at"])
+
+    # constructors, one per source shape
+    @classmethod
+    def from_rest(cls, r):
+        """GET /users/{owner}/repos item."""
+        return cls(
+            name=r["name"],
+            private=bool(r.get("private", False)),
+            archived=bool(r.get("archived", False)),
+            open_issues=int(r.get("open_issues_count", 0) or 0),
+            size_kb=int(r.get("size", 0) or 0),
+            pushed_at=r.get("pushed_at") or "",
+            default_branch=sys.intern(r.get("default_branch") or "main"),
+            html_url=r.get("html_url") or "",
+        )
+
+    @classmethod
+    def from_graphql(cls, n):
+        """GraphQL repository node (graphql_inventory.INVENTORY_QUERY)."""
+        readme = n.get("readme") or {}
+        return cls(
+            name=n["name"],
+            private=bool(n.get("isPrivate", False)),
+            archived=bool(n.get("isArchived", False)),
+            # REST open_issues_count counts open PRs too
+            open_issues=int((n.get("openIssues") or {}).get("totalCount", 0)) + int((n.get("openPulls") or {}).get("totalCount", 0)),
+            size_kb=int(n.get("diskUsage") or 0),
+            pushed_at=n.get("pushedAt") or "",
+            default_branch=sys.intern((n.get("defaultBranchRef") or {}).get("name") or "main"),
+            html_url=n.get("url") or "",
+            description=n.get("description") or "",
+            updated_at=n.get("updatedAt") or "",
+            rules_md=bool(n.get("rules")),
+            readme_md=bool(readme),
+            readme_oid=readme.get("oid"),
+        )
+
+    @classmethod
+    def from_gh_json(cls, d):
+        """`gh repo list --json defaultBranchRef,description,isPrivate,name,updatedAt,url` item."""
+        ref = d.get("defaultBranchRef")
+        return cls(
+            name=(d.get("name") or "").strip(),
+            private=bool(d.get("isPrivate")),
+            default_branch=sys.intern(ref["name"]) if isinstance(ref, dict) and ref.get("name") is not None else None,
+            html_url=d.get("url") or "",
+            description=d.get("description") or "",
+            updated_at=d.get("updatedAt") or "",
+        )
+
+    @classmethod
+    def from_dict(cls, d):
+        """Inverse of to_dict()."""
+        return cls(**{k: d[k] for k in FIELDS if k in d})
+
+    # JSON shapes
+    def to_dict(self):
+        out = {}
+        for k in FIELDS:
+            try:
+                out[k] = getattr(self, k)
+            except AttributeError:
+                pass
+        return out
+
+    def to_gh_json(self):
+        br = self.get("default_branch")
+        return {
+            "defaultBranchRef": {"name": br} if br is not None else None,
+            "description": self.get("description") or "",
+            "isPrivate": self.private,
+            "name": self.name,
+            "updatedAt": self.get("updated_at") or self.get("pushed_at") or "",
+            "url": self.html_url,
+        }
+
+    @property
+    def tag(self):
+        return "ACTIVE" if self.get("pushed_at") else "UNKNOWN"
+
+    def to_item(self, risk_score=None):
+        """governance_v4_auto.py per-repo item."""
+        item = {
+            "name": self.name,
+            "private": self.private,
+            "archived": self.archived,
+            "open_issues": self.open_issues,
+            "size_kb": self.size_kb,
+            "tag": self.tag,
+            "url": self.html_url,
+            "pushed_at": self.pushed_at,
+        }
+        if risk_score is not None:
+            item["risk_score"] = risk_score
+        return item
+
+    # mapping-style access for callers that still treat records as dicts
+    def __getitem__(self, k):
+        if k not in FIELDS:
+            raise KeyError(k)
+        try:
+            return getattr(self, k)
+        except AttributeError:
+            raise KeyError(k) from None
+
+    def get(self, k, default=None):
+        return getattr(self, k, default) if k in FIELDS else default
+
+    def __contains__(self, k):
+        return k in FIELDS and hasattr(self, k)
+
+    def __eq__(self, other):
+        return isinstance(other, RepoRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"RepoRecord({self.to_dict()!r})"
+
+def _rest_item(i, rnd):
+    return {"name": f"repo-{i:06d}", "private": rnd.random() < 0.3, "archived": rnd.random() < 0.2,
+            "open_issues_count": rnd.randrange(0, 80), "size": rnd.randrange(0, 900000),
+            "pushed_at": f"2026-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}T12:00:00Z",
+            "default_branch": "main", "html_url": f"https://github.com/o/repo-{i:06d}"}
+
+def _dict_record(r):
+    # the dict list_repos() built before RepoRecord
+    return {"name": r["name"], "private": bool(r.get("private", False)), "archived": bool(r.get("archived", False)),
+            "open_issues": int(r.get("open_issues_count", 0) or 0), "size_kb": int(r.get("size", 0) or 0),
+            "pushed_at": r.get("pushed_at") or "", "default_branch": r.get("default_branch") or "main",
+            "html_url": r.get("html_url") or ""}
+
+def bench(n):
+    rnd = random.Random(3)
+    api = [_rest_item(i, rnd) for i in range(n)]
+    out = {"repos": n}
+    for label, build in (("dict", _dict_record), ("slots", RepoRecord.from_rest)):
+        tracemalloc.start()
+        recs = [build(r) for r in api]
+        cur, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        t0 = time.perf_counter()
+        if label == "dict":
+            s = sum(min(x["open_issues"], 50) + (0 if x["archived"] else 5) for x in recs)
+        else:
+            s = sum(min(x.open_issues, 50) + (0 if x.archived else 5) for x in recs)
+        out[f"{label}_bytes_per_repo"] = cur // n
+        out[f"{label}_scan_s"] = round(time.perf_counter() - t0, 4)
+        out[f"{label}_check"] = s
+        del recs
+    out["lossless"] = all(RepoRecord.from_dict(_dict_record(r)).to_dict() == _dict_record(r) for r in api[:1000])
+    return out
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        print(json.dumps(bench(int(args[1]) if len(args) > 1 else 100000)))
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Maintained index of governance runs: STATE/governance-v4/index.json.
+
+Runs are ordered by their parsed UTC time, not by directory name, so mixed
+`+02-00` / `Z` names sort correctly. Readers get latest / previous / N-th run
+without listing the directory.
+
+  python scripts/run_index.py --rebuild
+  python scripts/run_index.py latest
+"""
+import os, sys, json
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ROOT = Path("STATE/governance-v4")
+INDEX = "index.json"
+
+def parse_run_ts(name):
+    """Run dir name -> aware UTC datetime. Handles 2026-02-15T14-35-40+02-00,
+    2026-02-15T13-52-12.750714+00-00 and 2026-02-16T15-46-20Z."""
+    s = name.strip()
+    if s.endswith("Z"):
+        s, tz = s[:-1], "+00:00"
+    elif len(s) > 6 and s[-6] in "+-":
+        tz = s[-6:-3] + ":" + s[-2:]
+        s = s[:-6]
+    else:
+        tz = "+00:00"
+    date, _, clock = s.partition("T")
+    try:
+        return datetime.fromisoformat(f"{date}T{clock.replace('-', ':')}{tz}").astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+def _utc(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+class _Lock:
+    """Exclusive flock on <root>/.lock around a read-modify-write of the index
+    (same pattern as run_ledger._Lock)."""
+    def __init__(self, root):
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        self.f = open(root / ".lock", "a")
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+
+def _write(root, runs):
+    doc = {
+        "updated": _utc(datetime.now(timezone.utc)),
+        "latest": runs[-1]["id"] if runs else None,
+        "count": len(runs),
+        "runs": runs,
+    }
+    p = Path(root) / INDEX
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(INDEX + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, p)
+    return doc
+
+def rebuild(root=ROOT):
+    runs = []
+    for d in Path(root).iterdir() if Path(root).is_dir() else []:
+        dt = parse_run_ts(d.name) if d.is_dir() else None
+        if dt is not None:
+            runs.append({"id": d.name, "utc": _utc(dt)})
+    runs.sort(key=lambda r: r["utc"])
+    return _write(root, runs)
+
+def load(root=ROOT):
+    p = Path(root) / INDEX
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return rebuild(root)
+
+def add_run(run_dir, root=ROOT):
+    """Record a new run and atomically replace index.json."""
+    name = Path(run_dir).name
+    dt = parse_run_ts(name)
+    if dt is None:
+        raise ValueError(f"not a run dir name: {name}")
+    with _Lock(root):
+        runs = [r for r in load(root)["runs"] if r["id"] != name]
+        entry = {"id": name, "utc": _utc(dt)}
+        if runs and runs[-1]["utc"] > entry["utc"]:
+            runs.append(entry)
+            runs.sort(key=lambda r: r["utc"])
+        else:
+            runs.append(entry)
+        return _write(root, runs)
+
+def nth(n, root=ROOT):
+    """Run dir path, 0 = latest, 1 = previous, ...; None if there are not that many."""
+    runs = load(root)["runs"]
+    if n >= len(runs):
+        return None
+    return Path(root) / runs[-1 - n]["id"]
+
+def latest(root=ROOT):
+    return nth(0, root)
+
+def previous(root=ROOT):
+    return nth(1, root)
+
+def ordered(root=ROOT, newest_first=True):
+    runs = load(root)["runs"]
+    seq = reversed(runs) if newest_first else runs
+    return [Path(root) / r["id"] for r in seq]
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--rebuild"]:
+        print(json.dumps({"count": rebuild()["count"]}))
+    elif args[:1] == ["latest"]:
+        print(latest() or "")
+    elif args[:1] == ["previous"]:
+        print(previous() or "")
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
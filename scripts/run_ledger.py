@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Append-only run ledger: STATE/run-ledger/.
+
+Every run (governance, apply, core-log) appends one JSON line to runs.jsonl under
+an exclusive flock and fsyncs it, so concurrent writers never lose entries and the
+cost of a run does not grow with history. When the active segment passes
+LEDGER_SEGMENT_BYTES it is rotated into segments/ and recorded in index.json with
+its first/last timestamp, so readers skip whole segments.
+
+RULES.md is not touched by runs any more; `render` regenerates its run-log block
+from the ledger on demand.
+
+  python scripts/run_ledger.py append KIND [--key K] [--unique] key=value key:=JSON ...
+  python scripts/run_ledger.py last [N]
+  python scripts/run_ledger.py between START [END]     (ISO dates or timestamps, inclusive)
+  python scripts/run_ledger.py render [RULES.md]
+"""
+import os, sys, json
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ROOT = Path("STATE/run-ledger")
+ACTIVE = "runs.jsonl"
+INDEX = "index.json"
+SEGMENT_BYTES = int(os.environ.get("LEDGER_SEGMENT_BYTES") or 1 << 20)
+
+BEGIN = "<!-- AUTO:RUNLOG:BEGIN -->"
+END = "<!-- AUTO:RUNLOG:END -->"
+HEADING = "## 🧾 יומן ריצות Governance v4 (אוטומטי)"
+
+def utc_now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class _Lock:
+    def __init__(self, root):
+        root.mkdir(parents=True, exist_ok=True)
+        self.f = open(root / ".lock", "a")
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+
+def load_index(root=ROOT):
+    p = Path(root) / INDEX
+    try:
+        return json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"segments": []}
+
+def _write_index(root, doc):
+    p = Path(root) / INDEX
+    tmp = p.with_name(INDEX + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, p)
+
+def _rotate(root):
+    """Move the active segment into segments/ and index it. Caller holds the lock."""
+    active = root / ACTIVE
+    entries = list(_read(active))
+    if not entries:
+        return
+    first, last = entries[0]["ts"], entries[-1]["ts"]
+    seg = Path("segments") / f"runs-{first.replace(':', '-')}.jsonl"
+    n = 2
+    while (root / seg).exists():
+        seg = seg.with_name(f"runs-{first.replace(':', '-')}__{n}.jsonl")
+        n += 1
+    (root / seg).parent.mkdir(parents=True, exist_ok=True)
+    os.replace(active, root / seg)
+    doc = load_index(root)
+    doc["segments"].append({"file": seg.as_posix(), "first": first, "last": last,
+                            "count": len(entries), "bytes": (root / seg).stat().st_size})
+    _write_index(root, doc)
+
+def append(kind, root=ROOT, key=None, unique=False, **fields):
+    """Append one entry; returns it, or None when unique and key was already logged in
+    the last two days (core-log keys carry their local date)."""
+    root = Path(root)
+    entry = {"ts": utc_now(), "kind": kind}
+    if key:
+        entry["key"] = key
+    entry.update(fields)
+    line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    with _Lock(root):
+        if unique and key and has_key(key, (datetime.now(timezone.utc) - timedelta(days=2)).strftime("%Y-%m-%d"), root):
+            return None
+        fd = os.open(root / ACTIVE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size >= SEGMENT_BYTES:
+            _rotate(root)
+    return entry
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        pass  # torn line from a crashed writer
+    except FileNotFoundError:
+        return
+
+def _tail(path, n, block=1 << 16):
+    """Last n entries of a segment, reading backwards from the end."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos, buf = f.tell(), b""
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    out = []
+    for line in buf.splitlines()[-n:] if n else []:
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            pass
+    return out[-n:] if n else []
+
+def segments(root=ROOT):
+    """Segment paths oldest first; the active segment is last."""
+    root = Path(root)
+    return [root / s["file"] for s in load_index(root)["segments"]] + [root / ACTIVE]
+
+def last(n=10, root=ROOT):
+    """The n most recent entries, oldest first."""
+    root = Path(root)
+    out = _tail(root / ACTIVE, n)
+    for s in reversed(load_index(root)["segments"]):
+        if len(out) >= n:
+            break
+        out = _tail(root / s["file"], n - len(out)) + out
+    return out
+
+def between(start, end=None, root=ROOT):
+    """Entries with start <= ts <= end. Bounds may be dates or timestamp prefixes."""
+    root = Path(root)
+    hi = (lambda ts: ts[:len(end)] <= end) if end else (lambda ts: True)
+    paths = [root / s["file"] for s in load_index(root)["segments"]
+             if s["last"] >= start and hi(s["first"])]
+    for p in paths + [root / ACTIVE]:
+        for e in _read(p):
+            ts = e.get("ts", "")
+            if ts >= start and hi(ts):
+                yield e
+
+def has_key(key, since, root=ROOT):
+    return any(e.get("key") == key for e in between(since, root=root))
+
+def format_entry(e):
+    ts, kind = e.get("ts", ""), e.get("kind", "")
+    if kind == "governance":
+        out = [f"- {ts} | governance_v4_auto.py (GITHUB_TOKEN only)",
+               f"  - total_repos={e.get('total_repos')} top_n={e.get('top_n')}"]
+        if e.get("owners"):
+            out.append(f"  - owners: {', '.join(e['owners'])}")
+        out.append(f"  - outputs: {', '.join(e.get('outputs') or [])}")
+        return out
+    if kind == "apply":
+        return [f"- {ts} | APPLY MOVE-ONLY (Actions)",
+                f"  - applied={e.get('applied')} scanned={e.get('scanned')}",
+                "  - policy: NO DELETE (MOVE ONLY to TRASH)"]
+    if kind == "core-log":
+        return [f"- {ts} | [{e.get('category')}] {e.get('title')}",
+                f"  - מה בוצע: {e.get('did')}",
+                f"  - מה הבא: {e.get('next')}",
+                f"  - חסמים: {e.get('blockers') or 'אין חסמים ידועים כרגע'}"]
+    rest = " ".join(f"{k}={v}" for k, v in e.items() if k not in ("ts", "kind"))
+    return [f"- {ts} | {kind} {rest}".rstrip()]
+
+def render(rules="RULES.md", root=ROOT, limit=None):
+    """Rewrite only the AUTO:RUNLOG block of RULES.md from the ledger."""
+    rules = Path(rules)
+    entries = last(limit, root) if limit else [e for p in segments(root) for e in _read(p)]
+    block = [BEGIN, HEADING, ""]
+    for e in entries:
+        block += format_entry(e)
+    block.append(END)
+    txt = rules.read_text(encoding="utf-8", errors="replace") if rules.exists() else ""
+    i, j = txt.find(BEGIN), txt.find(END)
+    if i >= 0 and j > i:
+        txt = txt[:i] + "\n".join(block) + txt[j + len(END):]
+    else:
+        txt = txt.rstrip("\n") + "\n\n" + "\n".join(block) + "\n"
+    rules.write_text(txt, encoding="utf-8")
+    return len(entries)
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else ""
+    if cmd == "append" and len(args) >= 2:
+        kind, rest = args[1], args[2:]
+        key, unique, fields = None, False, {}
+        while rest:
+            a = rest.pop(0)
+            if a == "--key":
+                key = rest.pop(0)
+            elif a == "--unique":
+                unique = True
+            else:
+                k, _, v = a.partition("=")
+                if k.endswith(":"):
+                    fields[k[:-1]] = json.loads(v)
+                else:
+                    fields[k] = v
+        e = append(kind, key=key, unique=unique, **fields)
+        if e is None:
+            print("SKIP: already logged")
+            raise SystemExit(3)
+        print(json.dumps(e, ensure_ascii=False))
+    elif cmd == "last":
+        for e in last(int(args[1]) if len(args) > 1 else 10):
+            print(json.dumps(e, ensure_ascii=False))
+    elif cmd == "between" and len(args) >= 2:
+        for e in between(args[1], args[2] if len(args) > 2 else None):
+            print(json.dumps(e, ensure_ascii=False))
+    elif cmd == "render":
+        print(f"rendered {render(args[1] if len(args) > 1 else 'RULES.md')} entries")
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Rename tracked paths that Windows cannot check out, in one batch.
+
+Every rename is planned up front from one `git ls-files -s`: illegal characters
+become "-", and a target that clashes with a tracked path, a tracked directory or
+another target (case-insensitively, as on Windows) gets a -N suffix; a target
+under a path that is a tracked file is left alone and reported. Every rename is
+checked against the disk before the first one runs, and a failure midway renames
+the finished ones back. The work tree is renamed in one pass and the index is
+updated by a single `git update-index --index-info`, instead of one `git mv`
+process per path.
+
+  python scripts/sanitize_paths.py [--chars ':"<>|?*'] [--dry-run]
+  python scripts/sanitize_paths.py --bench 500
+"""
+import os, sys, json, time, shutil, tempfile, subprocess
+
+ILLEGAL = ':"<>|?*'
+ZERO = "0" * 40
+
+def safe_name(s, chars=ILLEGAL, repl="-"):
+    return s.translate({ord(c): repl for c in chars})
+
+def _git(*args, cwd=None, input=None):
+    return subprocess.run(["git", *args], cwd=cwd, input=input, check=True, capture_output=True).stdout
+
+def index_entries(root="."):
+    """[(mode, sha, stage, path)] for every index entry."""
+    out = []
+    for rec in _git("ls-files", "-s", "-z", cwd=root).split(b"\0"):
+        if not rec:
+            continue
+        meta, _, path = rec.partition(b"\t")
+        mode, sha, stage = meta.decode().split()
+        out.append((mode, sha, int(stage), path.decode("utf-8", "surrogateescape")))
+    return out
+
+def _suffixed(path, n):
+    d, _, base = path.rpartition("/")
+    stem, dot, ext = base.rpartition(".")
+    if not dot or not stem:
+        stem, dot, ext = base, "", ""
+    return (d + "/" if d else "") + f"{stem}-{n}{dot}{ext}"
+
+def _parents(path):
+    parts = path.split("/")
+    return ["/".join(parts[:k]) for k in range(1, len(parts))]
+
+def plan(paths, chars=ILLEGAL, conflicts=None):
+    """[(old, new)] for every path with an illegal character, collision-free.
+    Paths that cannot be placed are appended to conflicts (when given) and not renamed."""
+    bad = [p for p in paths if any(c in p for c in chars)]
+    moving = set(bad)
+    files = {p.lower() for p in paths if p not in moving}
+    dirs = {d.lower() for p in paths if p not in moving for d in _parents(p)}
+    renames = []
+    for old in sorted(bad):
+        new = safe_name(old, chars)
+        if any(d.lower() in files for d in _parents(new)):
+            # a -N suffix on the file name cannot fix a clash higher up
+            if conflicts is not None:
+                conflicts.append((old, new))
+            continue
+        n = 1
+        cand = new
+        while cand.lower() in files or cand.lower() in dirs:
+            cand = _suffixed(new, n)
+            n += 1
+        files.add(cand.lower())
+        dirs.update(d.lower() for d in _parents(cand))
+        renames.append((old, cand))
+    return renames
+
+def apply(renames, entries, root="."):
+    """Rename on disk, then one index update for all of them."""
+    by_path = {p: (mode, sha) for mode, sha, stage, p in entries if stage == 0}
+    # unmerged entries are left to the merge
+    renames = [(old, new) for old, new in renames if old in by_path]
+    # check everything before touching the disk (an untracked file may sit on a target)
+    for old, new in renames:
+        dst = os.path.join(root, new)
+        if os.path.lexists(dst):
+            raise RuntimeError(f"target exists: {new} (for {old})")
+        for d in _parents(new):
+            if os.path.lexists(os.path.join(root, d)) and not os.path.isdir(os.path.join(root, d)):
+                raise RuntimeError(f"not a directory: {d} (for {old})")
+    done = []
+    try:
+        for old, new in renames:
+            src, dst = os.path.join(root, old), os.path.join(root, new)
+            if os.path.lexists(src):
+                # creates missing parents and prunes directories left empty
+                os.renames(src, dst)
+                done.append((src, dst))
+    except OSError:
+        for src, dst in reversed(done):
+            os.renames(dst, src)
+        raise
+    lines = []
+    for old, new in renames:
+        mode, sha = by_path[old]
+        lines.append(f"0 {ZERO}\t{old}")
+        lines.append(f"{mode} {sha}\t{new}")
+    if lines:
+        _git("update-index", "-z", "--index-info", cwd=root,
+             input="".join(l + "\0" for l in lines).encode("utf-8", "surrogateescape"))
+    return len(lines) // 2
+
+def sanitize(root=".", chars=ILLEGAL, dry_run=False):
+    entries = index_entries(root)
+    conflicts = []
+    renames = plan([e[3] for e in entries], chars, conflicts)
+    done = 0 if dry_run else apply(renames, entries, root)
+    return {"tracked": len(entries), "renames": renames, "conflicts": conflicts, "applied": done}
+
+def bench(n):
+    """Batched rename vs. the old one-`git mv`-per-path loop, on n colon paths."""
+    out = {"paths": n}
+    for label in ("git_mv_loop", "batch"):
+        tmp = tempfile.mkdtemp(prefix="sanitize-bench-")
+        try:
+            _git("init", "-q", tmp)
+            for i in range(n):
+                d = os.path.join(tmp, f"STATE/run-2026-01-{i % 28 + 1:02d}T10:00:00")
+                os.makedirs(d, exist_ok=True)
+                with open(os.path.join(d, f"f{i}:x.json"), "w") as f:
+                    f.write(str(i))
+            _git("add", "-A", cwd=tmp)
+            t0 = time.perf_counter()
+            if label == "batch":
+                doc = sanitize(tmp, ":")
+                moved = doc["applied"]
+            else:
+                moved = 0
+                for old, new in plan([e[3] for e in index_entries(tmp)], ":"):
+                    os.makedirs(os.path.dirname(os.path.join(tmp, new)), exist_ok=True)
+                    _git("mv", "-f", old, new, cwd=tmp)
+                    moved += 1
+            out[f"{label}_s"] = round(time.perf_counter() - t0, 3)
+            left = [p for p in _git("ls-files", "-z", cwd=tmp).decode().split("\0") if ":" in p]
+            out[f"{label}_moved"] = moved
+            # everything staged: no work tree vs. index differences, nothing untracked
+            st = _git("status", "--porcelain", "--untracked-files=all", cwd=tmp).decode().splitlines()
+            out[f"{label}_clean"] = not left and all(l[1] == " " for l in st)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return out
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        print(json.dumps(bench(int(args[1]) if len(args) > 1 else 500)))
+        return
+    chars = ILLEGAL
+    if "--chars" in args:
+        chars = args[args.index("--chars") + 1]
+    doc = sanitize(".", chars, dry_run="--dry-run" in args)
+    for old, new in doc["renames"]:
+        print(f"{'WOULD RENAME' if '--dry-run' in args else 'RENAMED'}: {old} -> {new}")
+    for old, new in doc["conflicts"]:
+        print(f"CONFLICT (left as is): {old} -> {new} (a parent is a tracked file)")
+    print(json.dumps({"tracked": doc["tracked"], "renames": len(doc["renames"]),
+                      "conflicts": len(doc["conflicts"]), "applied": doc["applied"]}))
+
+if __name__ == "__main__":
+    main()
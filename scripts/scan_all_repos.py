@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import os, json
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import gh_client
+import rate_limit
+import sanitize_paths
+from governance_v4_auto import list_repos, parse_owners, owner_kind
+from graphql_inventory import list_repos_graphql
+
+def has_file(client, owner, repo, path):
+    st, _, _ = client.get(f"repos/{owner}/{repo}/contents/{path}", priority=rate_limit.README)
+    return st == 200
+
+def has_readme(client, owner, repo):
+    # any README variant, the same set graphql_inventory.README_PATHS looks for
+    st, _, _ = client.get(f"repos/{owner}/{repo}/readme", priority=rate_limit.README)
+    return st == 200
+
+def token_login(client):
+    """Login of the token's user (GET /user), or None without a usable token."""
+    if not client.token:
+        return None
+    st, _, body = client.get("user")
+    return json.loads(body).get("login") if st == 200 else None
+
+def scan_owner(client, owner, kind, limit, workers):
+    """[(repo, rules_ok, readme_ok)] for one owner (user or org), sorted by name."""
+    # GraphQL needs a token; it answers both file checks for 50 repos per request
+    mode = os.environ.get("SCAN_MODE") or ("graphql" if client.token else "rest")
+    if mode == "graphql":
+        repos, _ = list_repos_graphql(owner, client)
+        repos = sorted(repos, key=lambda r: r["name"].lower())[:limit]
+        return [(r["name"], r["rules_md"], r["readme_md"]) for r in repos]
+
+    # /users/{owner}/repos lists public repos only; the owner's own token sees the
+    # private ones through /user/repos, like `gh repo list` did
+    if kind == "user" and client.token and (token_login(client) or "").lower() == owner.lower():
+        kind = "self"
+    repos, _ = list_repos(owner, client.token, kind=kind)
+    names = [r["name"] for r in repos][:limit]
+
+    def check(r):
+        return r, has_file(client, owner, r, "RULES.md"), has_readme(client, owner, r)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check, names))
+
+def main():
+    # OWNERS="a, org:b" scans several owners in one run (each under its own heading);
+    # LIMIT is optional, by default every repo is scanned
+    owners = parse_owners(os.environ.get("OWNERS") or os.environ.get("OWNER") or "yanivmizrachiy")
+    limit = int(os.environ["LIMIT"]) if os.environ.get("LIMIT") else None
+    workers = int(os.environ.get("SCAN_CONCURRENCY") or "8")
+    client = gh_client.default_client(gh_client.resolve_token())
+
+    date = datetime.now().astimezone().isoformat(timespec="seconds")
+    out = Path(f"STATE/scan_{sanitize_paths.safe_name(date)}.md")
+
+    def one(entry):
+        kind, owner = entry
+        if kind == "auto":
+            kind = owner_kind(owner, client.token) if len(owners) > 1 else "user"
+        return owner, scan_owner(client, owner, kind, limit, workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(4, len(owners)))) as pool:
+        scanned = list(pool.map(one, owners))
+
+    lines = [f"# GOVERNANCE SCAN — {date}", ""]
+    for owner, results in scanned:
+        prefix = f"{owner}/" if len(scanned) > 1 else ""
+        for r, rules_ok, readme_ok in results:
+            lines.append(f"## {prefix}{r}")
+            lines.append("- RULES.md: OK" if rules_ok else "- RULES.md: ❌ MISSING")
+            lines.append("- README.md: OK" if readme_ok else "- README.md: ❌ MISSING")
+            lines.append("")
+    out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"Scan complete: {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Risk scoring shared by governance_v4_auto.py, build_v4.py and pipeline.py.
+
+All weights live here. Records are turned into column arrays once, every score term
+is computed over whole columns (NumPy when installed, stdlib array otherwise), and
+the top N is taken with partial selection instead of a full sort.
+
+  python scripts/scoring.py --bench 1000000
+"""
+import sys, json, time, array, heapq, bisect, random
+
+from repo_record import RepoRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# governance_v4_auto.py: activity/size driven score (higher = look at it first)
+GOVERNANCE = {
+    "not_archived": 5.0,
+    "active": 4.0,
+    "issues_cap": 50, "issues_div": 10.0,
+    "size_cap": 500000, "size_div": 100000.0,
+    "private": 0.5,
+}
+
+# build_v4.py: staleness/duplication driven risk and the category cut-offs
+BUILD = {
+    "private": 1,
+    "age_over_120": 2,
+    "age_over_60": 1,
+    "no_description": 1,
+    "duplicate_name": 3,
+    "duplicate_description": 2,
+    "near_duplicate": 2,
+}
+CATEGORIES = [(6, "ARCHIVE_STRONG"), (4, "DUPLICATE_RISK"), (2, "REVIEW"), (0, "SAFE")]
+
+def risk_score(x, w=GOVERNANCE):
+    """Per-record governance score (same value as score_columns for one row)."""
+    score = 0
+    if not x["archived"]: score += w["not_archived"]
+    if x["tag"] == "ACTIVE": score += w["active"]
+    score += min(int(x["open_issues"]), w["issues_cap"]) / w["issues_div"]
+    score += min(int(x["size_kb"]), w["size_cap"]) / w["size_div"]
+    if x["private"]: score += w["private"]
+    return score
+
+def columns(records):
+    """Governance inputs as typed columns, parsed once. Takes RepoRecords (list_repos)
+    or item dicts."""
+    cols = {"archived": array.array("B"), "active": array.array("B"), "open_issues": array.array("q"),
+            "size_kb": array.array("q"), "private": array.array("B")}
+    if records and isinstance(records[0], RepoRecord):
+        for x in records:
+            cols["archived"].append(x.archived)
+            cols["active"].append(1 if x.pushed_at else 0)
+            cols["open_issues"].append(x.open_issues)
+            cols["size_kb"].append(x.size_kb)
+            cols["private"].append(x.private)
+        return cols
+    for x in records:
+        cols["archived"].append(1 if x.get("archived") else 0)
+        cols["active"].append(1 if (x.get("tag") == "ACTIVE" if "tag" in x else x.get("pushed_at")) else 0)
+        cols["open_issues"].append(int(x.get("open_issues") or 0))
+        cols["size_kb"].append(int(x.get("size_kb") or 0))
+        cols["private"].append(1 if x.get("private") else 0)
+    return cols
+
+def score_columns(cols, w=GOVERNANCE):
+    """Scores for every row. The terms are added in risk_score's order, so NumPy and
+    stdlib give identical doubles; round(.., 4) only when storing."""
+    if np is not None:
+        arch = np.frombuffer(cols["archived"], dtype=np.uint8)
+        s = (1 - arch) * w["not_archived"]
+        s = s + np.frombuffer(cols["active"], dtype=np.uint8) * w["active"]
+        s = s + np.minimum(np.frombuffer(cols["open_issues"], dtype=np.int64), w["issues_cap"]) / w["issues_div"]
+        s = s + np.minimum(np.frombuffer(cols["size_kb"], dtype=np.int64), w["size_cap"]) / w["size_div"]
+        s = s + np.frombuffer(cols["private"], dtype=np.uint8) * w["private"]
+        return array.array("d", s.astype(np.float64).tobytes())
+    na, ac, pr = w["not_archived"], w["active"], w["private"]
+    ic, idv, sc, sdv = w["issues_cap"], w["issues_div"], w["size_cap"], w["size_div"]
+    return array.array("d", [
+        (0 if a else na) + (ac if t else 0) + min(i, ic) / idv + min(z, sc) / sdv + (pr if p else 0)
+        for a, t, i, z, p in zip(cols["archived"], cols["active"], cols["open_issues"], cols["size_kb"], cols["private"])
+    ])
+
+def top_n(scores, n):
+    """Indices of the n highest scores, best first; ties keep input order."""
+    total = len(scores)
+    n = max(0, min(n, total))
+    if n == 0:
+        return []
+    if np is not None and total > 4 * n:
+        s = np.frombuffer(scores, dtype=np.float64)
+        kth = np.partition(s, total - n)[total - n]
+        above = np.flatnonzero(s > kth)
+        sel = np.concatenate([above, np.flatnonzero(s == kth)[:n - len(above)]])
+        return sel[np.lexsort((sel, -s[sel]))].tolist()
+    # nlargest is stable: equal scores come back in index order
+    return heapq.nlargest(n, range(total), key=scores.__getitem__)
+
+def build_risk(private, age_days, has_description, dup_name=False, dup_desc=False, near_dup=False, w=BUILD):
+    risk = 0
+    if private: risk += w["private"]
+    if age_days > 120: risk += w["age_over_120"]
+    elif age_days > 60: risk += w["age_over_60"]
+    if not has_description: risk += w["no_description"]
+    if dup_name: risk += w["duplicate_name"]
+    if dup_desc: risk += w["duplicate_description"]
+    if near_dup: risk += w["near_duplicate"]
+    return risk
+
+def category(risk):
+    for cut, name in CATEGORIES:
+        if risk >= cut:
+            return name
+    return CATEGORIES[-1][1]
+
+def critical(name, age_days):
+    """build_v4.py criticality: core/system repos first, then anything touched lately."""
+    lname = name.lower()
+    if ("system" in lname) or ("core" in lname):
+        return "HIGH"
+    if age_days < 30:
+        return "MEDIUM"
+    return "LOW"
+
+# lifecycle tag by days since updatedAt, as in the repo-tags script
+# (STATE/_repo_tags_fix_2026-02-15T13-30-48+02-00.py); anything older is ARCHIVE
+LIFECYCLE = [(45, "ACTIVE"), (365, "CLEANUP")]
+
+def lifecycle(age_days):
+    for cut, name in LIFECYCLE:
+        if age_days <= cut:
+            return name
+    return "ARCHIVE"
+
+# first ages at which critical (< 30), build_risk (> 60, > 120) or lifecycle change
+AGE_CUTS = tuple(sorted({30, 61, 121} | {cut + 1 for cut, _ in LIFECYCLE}))
+
+def age_band(age_days):
+    """Which side of every AGE_CUTS threshold an age is on; stable between crossings."""
+    return bisect.bisect_right(AGE_CUTS, age_days)
+
+def synthetic(n, seed=11):
+    rnd = random.Random(seed)
+    return [{"name": f"repo-{i:07d}", "archived": rnd.random() < 0.2, "tag": "ACTIVE" if rnd.random() < 0.9 else "UNKNOWN",
+             "open_issues": rnd.randrange(0, 120), "size_kb": rnd.randrange(0, 900000), "private": rnd.random() < 0.3}
+            for i in range(n)]
+
+def bench(n, k=20):
+    recs = synthetic(n)
+    t0 = time.perf_counter()
+    old = sorted(recs, key=lambda x: -risk_score(x))[:k]
+    t1 = time.perf_counter()
+    cols = columns(recs)
+    t2 = time.perf_counter()
+    scores = score_columns(cols)
+    idx = top_n(scores, k)
+    t3 = time.perf_counter()
+    new = [recs[i] for i in idx]
+    return {"repos": n, "top": k, "numpy": np is not None,
+            "per_dict_sort_s": round(t1 - t0, 3), "columns_s": round(t2 - t1, 3),
+            "vector_score_topn_s": round(t3 - t2, 3), "same_top": [r["name"] for r in old] == [r["name"] for r in new]}
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--bench"]:
+        print(json.dumps(bench(int(args[1]) if len(args) > 1 else 1000000)))
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Content-addressed store for governance run snapshots.
+
+Each run dir keeps a small manifest.json. Per-repo records (and whole dashboards)
+live once under STATE/snapshot-store/objects, keyed by sha256, so runs that see the
+same repos share the same blobs. Full files are rebuilt on read, byte for byte.
+
+  python scripts/snapshot_store.py --compact [--keep 1]   # migrate existing run dirs
+  python scripts/snapshot_store.py show RUN_DIR [FILE]    # print a rebuilt file
+"""
+import os, sys, json, hashlib
+from pathlib import Path
+
+import run_index
+
+RUNS_ROOT = run_index.ROOT
+STORE_ROOT = Path("STATE/snapshot-store")
+MANIFEST = "manifest.json"
+JSON_FILES = ("repo-intelligence-v4.json",)
+JSONL_FILES = ("repo-intelligence-v4.jsonl", "inventory.jsonl")
+TEXT_FILES = ("dashboard-v4.md", "timings.json")
+
+def _dumps(doc):
+    # the exact serialization governance_v4_auto.py / build_v4.py write
+    return json.dumps(doc, ensure_ascii=False, indent=2)
+
+def put_blob(data, store=STORE_ROOT):
+    h = hashlib.sha256(data).hexdigest()
+    p = store / "objects" / h[:2] / h[2:]
+    if not p.exists():
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+    return h
+
+def get_blob(h, store=STORE_ROOT):
+    return (store / "objects" / h[:2] / h[2:]).read_bytes()
+
+def _record(rec):
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def split_doc(doc, store=STORE_ROOT):
+    """Top-level lists of records become lists of blob hashes; everything else stays inline."""
+    out = {}
+    for k, v in doc.items():
+        if isinstance(v, list) and v and all(isinstance(x, dict) for x in v):
+            out[k] = {"$blobs": [put_blob(_record(x), store) for x in v]}
+        else:
+            out[k] = v
+    return out
+
+def join_doc(doc, store=STORE_ROOT):
+    out = {}
+    for k, v in doc.items():
+        if isinstance(v, dict) and list(v) == ["$blobs"]:
+            out[k] = [json.loads(get_blob(h, store)) for h in v["$blobs"]]
+        else:
+            out[k] = v
+    return out
+
+def read_manifest(run_dir):
+    p = Path(run_dir) / MANIFEST
+    if not p.is_file():
+        return None
+    return json.loads(p.read_text(encoding="utf-8"))
+
+def run_files(run_dir):
+    """Relative paths of the full files in run_dir, including sweep runs' owners/<login>/."""
+    run_dir = Path(run_dir)
+    bases = [run_dir] + sorted(p for p in (run_dir / "owners").glob("*") if p.is_dir())
+    out = []
+    for base in bases:
+        prefix = "" if base == run_dir else base.relative_to(run_dir).as_posix() + "/"
+        out += [prefix + n for n in JSON_FILES + JSONL_FILES + TEXT_FILES if (base / n).is_file()]
+    return out
+
+def store_run(run_dir, store=STORE_ROOT):
+    """Write manifest.json for run_dir from the full files present in it."""
+    run_dir = Path(run_dir)
+    manifest = read_manifest(run_dir) or {"format": "cas-v1", "files": {}}
+    names = run_files(run_dir)
+    for name in [n for n in names if n.rsplit("/", 1)[-1] in JSON_FILES]:
+        p = run_dir / name
+        if p.is_file():
+            try:
+                doc = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if isinstance(doc, dict):
+                manifest["files"][name] = {"json": split_doc(doc, store)}
+    for name in [n for n in names if n.rsplit("/", 1)[-1] in JSONL_FILES]:
+        p = run_dir / name
+        if p.is_file():
+            # record lines are already in blob form (compact JSON), so they share blobs
+            # with the pretty document; $header / $footer lines stay inline
+            lines = []
+            with p.open("rb") as f:
+                for line in f:
+                    line = line.rstrip(b"\n")
+                    if line.startswith(b'{"$'):
+                        lines.append(line.decode("utf-8"))
+                    else:
+                        lines.append({"$blob": put_blob(line, store)})
+            manifest["files"][name] = {"jsonl": lines}
+    for name in [n for n in names if n.rsplit("/", 1)[-1] in TEXT_FILES]:
+        manifest["files"][name] = {"blob": put_blob((run_dir / name).read_bytes(), store)}
+    (run_dir / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return manifest
+
+def rebuild(run_dir, name, store=STORE_ROOT):
+    """Bytes of run_dir/name, from disk if present, else rebuilt from the manifest."""
+    p = Path(run_dir) / name
+    if p.is_file():
+        return p.read_bytes()
+    m = read_manifest(run_dir)
+    entry = (m or {}).get("files", {}).get(name)
+    if entry is None:
+        raise FileNotFoundError(str(p))
+    if "blob" in entry:
+        return get_blob(entry["blob"], store)
+    if "jsonl" in entry:
+        return b"".join((get_blob(x["$blob"], store) if isinstance(x, dict) else x.encode("utf-8")) + b"\n"
+                        for x in entry["jsonl"])
+    return _dumps(join_doc(entry["json"], store)).encode("utf-8")
+
+def load_json(run_dir, name="repo-intelligence-v4.json", store=STORE_ROOT):
+    return json.loads(rebuild(run_dir, name, store).decode("utf-8"))
+
+def has_file(run_dir, name):
+    if (Path(run_dir) / name).is_file():
+        return True
+    return name in ((read_manifest(run_dir) or {}).get("files") or {})
+
+def run_dirs(root=RUNS_ROOT):
+    """Run dirs, newest first by parsed UTC time (see run_index)."""
+    return [d for d in run_index.ordered(root) if d.is_dir()]
+
+def compact(root=RUNS_ROOT, keep=1, store=STORE_ROOT):
+    """Move every run but the newest `keep` onto manifests. A full file is removed only
+    after its rebuild from the store matches it byte for byte."""
+    stats = {"runs": 0, "compacted_files": 0, "kept_files": 0, "bytes_freed": 0}
+    for i, d in enumerate(run_dirs(root)):
+        names = run_files(d)
+        if not names:
+            continue
+        stats["runs"] += 1
+        store_run(d, store)
+        if i < keep:
+            continue
+        for n in names:
+            p = d / n
+            original = p.read_bytes()
+            p.rename(p.with_name(p.name + ".verify"))
+            try:
+                ok = rebuild(d, n, store) == original
+            except Exception:
+                ok = False
+            if ok:
+                p.with_name(p.name + ".verify").unlink()
+                stats["compacted_files"] += 1
+                stats["bytes_freed"] += len(original)
+            else:
+                p.with_name(p.name + ".verify").rename(p)
+                stats["kept_files"] += 1
+        for od in sorted((d / "owners").glob("*")) + [d / "owners"]:
+            if od.is_dir() and not any(od.iterdir()):
+                od.rmdir()
+    return stats
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["--compact"]:
+        keep = int(args[args.index("--keep") + 1]) if "--keep" in args else 1
+        print(json.dumps(compact(keep=keep)))
+    elif args[:1] == ["show"] and len(args) >= 2:
+        name = args[2] if len(args) > 2 else "repo-intelligence-v4.json"
+        sys.stdout.write(rebuild(args[1], name).decode("utf-8"))
+    else:
+        raise SystemExit(__doc__)
+
+if __name__ == "__main__":
+    main()
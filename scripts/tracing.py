@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Lightweight tracing for governance runs: nested spans and HTTP counters.
+
+Spans are aggregated by path ("enumerate/list_repos/fetch_page"): count, total,
+min and max seconds, so 100k repos do not mean 100k span objects. HTTP requests
+feed a status count, a latency histogram, retry counters and bytes on the wire.
+Disabled (the default), span() returns a shared no-op context and the record
+functions return after one flag check.
+
+  with tracing.span("scoring"):
+      ...
+  pool.map(tracing.wrap(fn), items)      # worker threads nest under the caller's span
+"""
+import os, json, time, threading
+from pathlib import Path
+
+# latency histogram upper bounds, ms
+BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_spans = {}
+_order = {}  # path -> first-start sequence, for reporting in run order
+_http = {}
+_counters = {}
+_t0 = 0.0
+
+def enable(on=True):
+    """Start (or stop) collecting; clears anything recorded before."""
+    global _enabled, _t0
+    with _lock:
+        _spans.clear()
+        _order.clear()
+        _counters.clear()
+        _http.clear()
+        _http.update({"requests": 0, "bytes": 0, "status": {}, "latency_ms": [0] * (len(BUCKETS) + 1),
+                      "latency_total_s": 0.0})
+        _t0 = time.perf_counter()
+        _enabled = on
+
+def enabled():
+    return _enabled
+
+def from_env():
+    enable(os.environ.get("TRACE", "1") != "0")
+
+def _stack():
+    s = getattr(_local, "stack", None)
+    if s is None:
+        s = _local.stack = []
+    return s
+
+def current():
+    s = _stack()
+    return s[-1] if s else ""
+
+def record(path, seconds):
+    """Add one externally measured duration under path (e.g. from a worker process)."""
+    if not _enabled:
+        return
+    _order.setdefault(path, len(_order))
+    with _lock:
+        st = _spans.get(path)
+        if st is None:
+            _spans[path] = [1, seconds, seconds, seconds]
+        else:
+            st[0] += 1
+            st[1] += seconds
+            if seconds < st[2]: st[2] = seconds
+            if seconds > st[3]: st[3] = seconds
+
+class _Span:
+    __slots__ = ("path", "t")
+
+    def __init__(self, name):
+        parent = current()
+        self.path = parent + "/" + name if parent else name
+
+    def __enter__(self):
+        _order.setdefault(self.path, len(_order))
+        _stack().append(self.path)
+        self.t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.path, time.perf_counter() - self.t)
+        _stack().pop()
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NOOP = _Noop()
+
+def span(name):
+    return _Span(name) if _enabled else _NOOP
+
+def wrap(fn):
+    """fn for a worker thread, run under the caller's current span path."""
+    if not _enabled:
+        return fn
+    parent = current()
+
+    def run(*a, **kw):
+        s = _stack()
+        s.append(parent)
+        try:
+            return fn(*a, **kw)
+        finally:
+            s.pop()
+    return run
+
+def count(name, n=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def http(status, seconds, nbytes):
+    """One HTTP exchange as sent on the wire (every retry counts)."""
+    if not _enabled:
+        return
+    ms = seconds * 1000.0
+    b = 0
+    while b < len(BUCKETS) and ms > BUCKETS[b]:
+        b += 1
+    with _lock:
+        _http["requests"] += 1
+        _http["bytes"] += nbytes
+        _http["latency_total_s"] += seconds
+        _http["latency_ms"][b] += 1
+        k = str(status)
+        _http["status"][k] = _http["status"].get(k, 0) + 1
+
+def _quantile(hist, q):
+    total = sum(hist)
+    if not total:
+        return None
+    need, seen = q * total, 0
+    for i, n in enumerate(hist):
+        seen += n
+        if seen >= need:
+            return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+    return None
+
+def report():
+    with _lock:
+        spans = [{"path": p, "depth": p.count("/"), "count": c, "total_s": round(t, 4),
+                  "min_s": round(lo, 4), "max_s": round(hi, 4)} for p, (c, t, lo, hi) in _spans.items()]
+        http_doc = dict(_http, status=dict(sorted(_http.get("status", {}).items())),
+                        latency_ms=dict(zip([f"<={b}" for b in BUCKETS] + [f">{BUCKETS[-1]}"], _http.get("latency_ms", []))))
+        counters = dict(sorted(_counters.items()))
+    hist = list(http_doc["latency_ms"].values())
+    http_doc["latency_p50_ms"] = _quantile(hist, 0.5)
+    http_doc["latency_p95_ms"] = _quantile(hist, 0.95)
+    http_doc["latency_total_s"] = round(http_doc.get("latency_total_s", 0.0), 4)
+    def key(s):
+        parts = s["path"].split("/")
+        return [_order.get("/".join(parts[:i + 1]), 1 << 30) for i in range(len(parts))]
+    spans.sort(key=key)
+    return {"enabled": _enabled, "wall_s": round(time.perf_counter() - _t0, 4) if _enabled else 0.0,
+            "spans": spans, "http": http_doc, "counters": counters}
+
+def write(path, doc=None):
+    doc = doc or report()
+    Path(path).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    return doc
+
+def dashboard_lines(doc=None, max_depth=2):
+    """'## Timings' section: spans down to max_depth, then the HTTP summary."""
+    doc = doc or report()
+    if not doc["enabled"]:
+        return []
+    lines = ["## Timings", f"- wall so far: {doc['wall_s']}s (full breakdown in timings.json)"]
+    for s in doc["spans"]:
+        if s["depth"] <= max_depth:
+            calls = f" x{s['count']}" if s["count"] > 1 else ""
+            lines.append(f"{'  ' * s['depth']}- {s['path'].rsplit('/', 1)[-1]}: {s['total_s']}s{calls}")
+    h = doc["http"]
+    if h.get("requests"):
+        statuses = " ".join(f"{k}={v}" for k, v in h["status"].items())
+        lines.append(f"- http: requests={h['requests']} bytes={h['bytes']} p50<={h['latency_p50_ms']}ms "
+                     f"p95<={h['latency_p95_ms']}ms | {statuses}")
+    if doc["counters"]:
+        lines.append("- counters: " + " ".join(f"{k}={v}" for k, v in doc["counters"].items()))
+    lines.append("")
+    return lines